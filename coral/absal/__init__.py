@@ -1,3 +1,4 @@
 from .commute import *
 from .groups import *
 from .rings import *
+from .permutations import *
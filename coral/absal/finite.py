@@ -0,0 +1,129 @@
+from collections import deque
+
+from coral.utils import typename
+from coral.maps import ClosureError
+
+
+class FiniteGroupEngine:
+
+	def __init__(self, group):
+		if group.cset.is_infinite:
+			raise ValueError(f'Cannot index the elements of an infinite group')
+		index = group.cset._index
+		if index is None:
+			raise TypeError(f'Cannot index a group of unhashable elements')
+		self.elements = tuple(index)
+		self.index = index
+		self.order = len(self.elements)
+		self.identity = index[group.identity]
+		self._inverses = {self.identity: self.identity}
+		binop = group.binop
+		table = binop.table
+		# a table over the same elements in the same order already holds every product as an index
+		if table is not None and table.elements == self.elements:
+			self.product = table
+			self._divide = table.left_division()
+		else:
+			self.product = self._evaluator(binop._func)
+			self._divide = self._evaluator(binop._inverse._func)
+
+	def __repr__(self):
+		return f'{typename(self)}(order={self.order})'
+
+	def _evaluator(self, _func):
+		elements, index = self.elements, self.index
+		def evaluate(i, j):
+			result = _func(elements[i], elements[j])
+			try:
+				return index[result]
+			except (KeyError, TypeError):
+				raise ClosureError(f'Operation output {result} is not in the group') from None
+		return evaluate
+
+	def indices_of(self, elements):
+		try:
+			return [self.index[element] for element in elements]
+		except (KeyError, TypeError) as error:
+			raise ValueError(f'{error.args[0]} is not in the group') from None
+
+	def elements_of(self, indices):
+		return tuple(self.elements[i] for i in indices)
+
+	def inverse(self, i):
+		try:
+			return self._inverses[i]
+		except KeyError:
+			# left division of the identity by i is the x with i*x == e
+			inverse = self._inverses[i] = self._divide(self.identity, i)
+			return inverse
+
+	def element_order(self, i):
+		order, power = 1, i
+		while not power == self.identity:
+			power = self.product(power, i)
+			order += 1
+			if order > self.order:
+				raise ValueError(f'{self.elements[i]} never reaches the identity')
+		return order
+
+	def closure(self, generators):
+		# in a finite group, products of generators already produce every inverse
+		generators = list(generators)
+		members = bytearray(self.order)
+		members[self.identity] = 1
+		reached = [self.identity]
+		frontier = deque(reached)
+		while frontier:
+			x = frontier.popleft()
+			for g in generators:
+				y = self.product(x, g)
+				if not members[y]:
+					members[y] = 1
+					reached.append(y)
+					frontier.append(y)
+		return reached
+
+	def generators(self, indices=None):
+		candidates = range(self.order) if indices is None else indices
+		generators, members = [], bytearray(self.order)
+		members[self.identity] = 1
+		for x in candidates:
+			if members[x]:
+				continue
+			generators.append(x)
+			for y in self.closure(generators):
+				members[y] = 1
+		return generators
+
+	def cosets(self, subgroup, side='left'):
+		if side not in ('left', 'right'):
+			raise ValueError(f"Expected 'left' or 'right', not {side}")
+		subgroup = list(subgroup)
+		assigned, cosets = bytearray(self.order), []
+		for g in range(self.order):
+			if assigned[g]:
+				continue
+			if side == 'left':
+				coset = [self.product(g, h) for h in subgroup]
+			else:
+				coset = [self.product(h, g) for h in subgroup]
+			for x in coset:
+				assigned[x] = 1
+			cosets.append(coset)
+		return cosets
+
+	def is_subgroup(self, indices):
+		indices = set(indices)
+		return self.identity in indices and set(self.closure(self.generators(indices))) == indices
+
+	def is_normal(self, indices):
+		members = bytearray(self.order)
+		for x in indices:
+			members[x] = 1
+		# conjugation is an automorphism, so it suffices to conjugate generators by generators
+		for g in self.generators():
+			g_inverse = self.inverse(g)
+			for h in self.generators(indices):
+				if not members[self.product(self.product(g, h), g_inverse)]:
+					return False
+		return True
@@ -1,8 +1,10 @@
 
 from .commute import Monoid
 from coral.utils import typename
-from coral.coralset import CoralSet
+from coral.coralset import CoralSet, CoralRange
 from coral.maps import InvertibleOperation, GroupOperation, addition_mod
+from .finite import FiniteGroupEngine
+from .lattice import SubgroupLattice
 
 class Group(Monoid):
 
@@ -10,11 +12,68 @@ class Group(Monoid):
 		if not isinstance(binop, GroupOperation):
 			raise TypeError(f'Expected a group operation, not a {typename(binop)}')
 		super().__init__(cset, identity, binop)
+		self._engine = None
+
+	def inverse(self, x):
+		return self.binop.left_divide(self.identity, x)
+
+	@property
+	def engine(self):
+		if self._engine is None:
+			self._engine = FiniteGroupEngine(self)
+		return self._engine
+
+	@property
+	def order(self):
+		if self.cset.is_infinite:
+			raise ValueError(f'Cannot take the order of an infinite group')
+		return len(self.cset)
+
+	def element_order(self, x):
+		return self.engine.element_order(*self.engine.indices_of((x,)))
+
+	def generators(self):
+		return self.engine.elements_of(self.engine.generators())
+
+	def generate(self, *generators):
+		engine = self.engine
+		elements = engine.elements_of(engine.closure(engine.indices_of(generators)))
+		return Group(CoralSet(elements), self.identity, self.binop)
+
+	def _indices_of(self, subgroup):
+		if not isinstance(subgroup, Group):
+			raise TypeError(f'Expected Group, not {typename(subgroup)}')
+		if subgroup.cset.is_infinite:
+			raise ValueError(f'Expected a finite subgroup')
+		return self.engine.indices_of(subgroup.cset)
+
+	def _subgroup_indices(self, subgroup):
+		indices = self._indices_of(subgroup)
+		if not self.engine.is_subgroup(indices):
+			raise ValueError(f'{subgroup.cset} is not a subgroup')
+		return indices
+
+	def left_cosets(self, subgroup):
+		engine = self.engine
+		return [CoralSet(engine.elements_of(coset)) for coset in engine.cosets(self._subgroup_indices(subgroup), 'left')]
+
+	def right_cosets(self, subgroup):
+		engine = self.engine
+		return [CoralSet(engine.elements_of(coset)) for coset in engine.cosets(self._subgroup_indices(subgroup), 'right')]
+
+	def is_normal_subgroup(self, subgroup):
+		indices = self._indices_of(subgroup)
+		return self.engine.is_subgroup(indices) and self.engine.is_normal(indices)
 
 	def is_subgroup(self, parent):
 		if not isinstance(parent, Group):
 			raise TypeError(f'Expected Group, not {typename(parent)}')
-		return self.cset.is_subset(parent.cset) and (self.identity == parent.identity)
+		return SUBGROUP_LATTICE.is_subgroup(self, parent)
+
+	def _contains_subgroup(self, child):
+		if not child.identity == self.identity:
+			return False
+		return self.cset.has_subset(child.cset)
 
 	def has_subgroup(self, child):
 		if not isinstance(child, Group):
@@ -22,9 +81,14 @@ class Group(Monoid):
 		return child.is_subgroup(self)
 
 
+# every answer is remembered here, so later queries about the same groups, or about chains
+# of them, are settled without touching their elements
+SUBGROUP_LATTICE = SubgroupLattice()
+
+
 def Z_mod(n):
 	if not isinstance(n, int):
 		raise TypeError('Z can only be partitioned by integer modulo')
 	if not n > 0:
 		raise ValueError('Z can only be partitioned by positive modulo')
-	return Group(CoralSet([*range(n)]), 0, GroupOperation.from_invertible(addition_mod(n)))
\ No newline at end of file
+	return Group(CoralRange(n), 0, GroupOperation.from_invertible(addition_mod(n)))
\ No newline at end of file
@@ -0,0 +1,86 @@
+import weakref
+
+from coral.utils import typename
+
+
+class SubgroupLattice:
+
+	def __init__(self):
+		# groups are unhashable, so they are tracked by id for as long as they are alive
+		self._groups = {}
+		self._above = {}
+		self._not_above = {}
+		self.hits = 0
+		self.misses = 0
+
+	def __repr__(self):
+		return f'{typename(self)}(groups={len(self._groups)}, containments={sum(map(len, self._above.values()))})'
+
+	def __len__(self):
+		return len(self._groups)
+
+	def _key(self, group):
+		key = id(group)
+		if key not in self._groups:
+			self._groups[key] = weakref.ref(group, lambda _, key=key: self._forget(key))
+			self._above[key] = set()
+			self._not_above[key] = set()
+		return key
+
+	def _forget(self, key):
+		self._groups.pop(key, None)
+		self._above.pop(key, None)
+		self._not_above.pop(key, None)
+		for related in (self._above, self._not_above):
+			for keys in related.values():
+				keys.discard(key)
+
+	def _group(self, key):
+		return self._groups[key]()
+
+	def record(self, child, parent, contained):
+		child_key, parent_key = self._key(child), self._key(parent)
+		(self._above if contained else self._not_above)[child_key].add(parent_key)
+
+	def _reaches(self, start, target):
+		seen, frontier = {start}, [start]
+		while frontier:
+			for key in self._above.get(frontier.pop(), ()):
+				if key == target:
+					return True
+				if key not in seen:
+					seen.add(key)
+					frontier.append(key)
+		return False
+
+	def known(self, child, parent):
+		# True or False when earlier answers settle the question, None otherwise
+		if id(child) not in self._groups or id(parent) not in self._groups:
+			return None
+		child_key, parent_key = id(child), id(parent)
+		if parent_key in self._not_above[child_key]:
+			return False
+		# proper containment is transitive and never runs both ways
+		if self._reaches(child_key, parent_key):
+			return True
+		if child_key == parent_key or self._reaches(parent_key, child_key):
+			return False
+		return None
+
+	def is_subgroup(self, child, parent):
+		contained = self.known(child, parent)
+		if contained is not None:
+			self.hits += 1
+			return contained
+		self.misses += 1
+		contained = parent._contains_subgroup(child)
+		self.record(child, parent, contained)
+		return contained
+
+	def subgroups_of(self, parent):
+		parent_key = self._key(parent)
+		return [self._group(key) for key in list(self._groups) if self._reaches(key, parent_key)]
+
+	def supergroups_of(self, child):
+		child_key = self._key(child)
+		return [self._group(key) for key in list(self._groups) if self._reaches(child_key, key)]
@@ -0,0 +1,332 @@
+from array import array
+from itertools import product
+from math import lcm, factorial
+import random
+
+from coral.utils import typename
+from coral.tables import _typecode
+from coral.coralset import CoralSet
+from coral.maps import GroupOperation
+from .groups import Group
+
+
+class Permutation:
+
+	def __init__(self, images):
+		images = array(_typecode(max(len(images), 1)), images)
+		if not sorted(images) == list(range(len(images))):
+			raise ValueError(f'Expected a rearrangement of 0 to {len(images) - 1}, not {tuple(images)}')
+		self.images = images
+		self._hash = None
+
+	@classmethod
+	def _of(cls, images):
+		# images already known to be a permutation skip validation
+		permutation = cls.__new__(cls)
+		permutation.images = images
+		permutation._hash = None
+		return permutation
+
+	@classmethod
+	def identity(cls, degree):
+		return cls(range(degree))
+
+	@classmethod
+	def from_cycles(cls, degree, *cycles):
+		images = list(range(degree))
+		for cycle in cycles:
+			for i, point in enumerate(cycle):
+				images[point] = cycle[(i + 1) % len(cycle)]
+		return cls(images)
+
+	@property
+	def degree(self):
+		return len(self.images)
+
+	def __repr__(self):
+		return f'{typename(self)}{tuple(self.images)}'
+
+	def __eq__(self, other):
+		if not isinstance(other, Permutation):
+			return False
+		return self.images == other.images
+
+	def __hash__(self):
+		if self._hash is None:
+			self._hash = hash(self.images.tobytes())
+		return self._hash
+
+	def __call__(self, point):
+		return self.images[point]
+
+	def __mul__(self, other):
+		# composition as functions, so (p*q)(x) == p(q(x))
+		if not isinstance(other, Permutation):
+			return NotImplemented
+		if not self.degree == other.degree:
+			raise ValueError(f'Cannot compose permutations of degree {self.degree} and {other.degree}')
+		images = self.images
+		return Permutation._of(array(images.typecode, [images[x] for x in other.images]))
+
+	def inverse(self):
+		images = array(self.images.typecode, bytes(len(self.images) * self.images.itemsize))
+		for point, image in enumerate(self.images):
+			images[image] = point
+		return Permutation._of(images)
+
+	@property
+	def is_identity(self):
+		return all(point == image for point, image in enumerate(self.images))
+
+	def cycles(self):
+		seen, cycles = bytearray(self.degree), []
+		for start in range(self.degree):
+			if seen[start] or self.images[start] == start:
+				continue
+			cycle, point = [], start
+			while not seen[point]:
+				seen[point] = 1
+				cycle.append(point)
+				point = self.images[point]
+			cycles.append(tuple(cycle))
+		return cycles
+
+	@property
+	def order(self):
+		return lcm(1, *map(len, self.cycles()))
+
+
+def _compose_images(p, q):
+	return tuple(map(p.__getitem__, q))
+
+
+def _invert_images(p):
+	inverse = [0] * len(p)
+	for point, image in enumerate(p):
+		inverse[image] = point
+	return tuple(inverse)
+
+
+class StabilizerChain:
+
+	def __init__(self, degree, generators, certainty=30, seed=None):
+		self.degree = degree
+		self.identity = tuple(range(degree))
+		self.base = []
+		# generators fixing the first i base points, and the orbit of the i-th base point under
+		# them, each orbit point carrying a (u, u inverse) pair with u mapping the base point to it
+		self.levels = []
+		self.transversals = []
+		self.rng = random.Random(seed)
+		generators = [images for images in generators if not images == self.identity]
+		for images in generators:
+			self._absorb(images)
+		if generators:
+			self._complete(generators, certainty)
+
+	@property
+	def order(self):
+		order = 1
+		for transversal in self.transversals:
+			order *= len(transversal)
+		return order
+
+	def sift(self, g):
+		for level, point in enumerate(self.base):
+			transversal = self.transversals[level]
+			image = g[point]
+			if image not in transversal:
+				return g, level
+			g = _compose_images(transversal[image][1], g)
+		return g, len(self.base)
+
+	def __contains__(self, g):
+		return self.sift(g)[0] == self.identity
+
+	def _absorb(self, g):
+		h, stop = self.sift(g)
+		if h == self.identity:
+			return False
+		if stop == len(self.base):
+			self.base.append(next(point for point, image in enumerate(h) if not point == image))
+			self.levels.append([])
+			self.transversals.append({self.base[-1]: (self.identity, self.identity)})
+		# h fixes every base point before stop, so it belongs to every stabilizer up to there
+		for level in range(stop + 1):
+			self.levels[level].append(h)
+			transversal = self.transversals[level]
+			frontier = []
+			for point, (u, _) in list(transversal.items()):
+				image = h[point]
+				if image not in transversal:
+					u = _compose_images(h, u)
+					transversal[image] = (u, _invert_images(u))
+					frontier.append(image)
+			while frontier:
+				point = frontier.pop()
+				for s in self.levels[level]:
+					image = s[point]
+					if image not in transversal:
+						u = _compose_images(s, transversal[point][0])
+						transversal[image] = (u, _invert_images(u))
+						frontier.append(image)
+		return True
+
+	def _complete(self, generators, certainty):
+		# random Schreier-Sims: random elements of the group are sifted through the chain and
+		# whatever survives extends it, until certainty elements in a row sift to the identity;
+		# the chain only ever holds group elements, so its order never overshoots
+		state = list(generators) * (10 // len(generators) + 1)
+		accumulator = self.identity
+		largest = factorial(self.degree)
+		# a state of many short generators needs a longer walk before its products look random
+		streak, warmup = 0, max(50, 10 * len(state))
+		while streak < certainty and self.order < largest:
+			i, j = self.rng.sample(range(len(state)), 2)
+			other = state[j] if self.rng.random() < 0.5 else _invert_images(state[j])
+			state[i] = _compose_images(state[i], other)
+			accumulator = _compose_images(accumulator, state[i])
+			if warmup:
+				warmup -= 1
+				continue
+			streak = 0 if self._absorb(accumulator) else streak + 1
+
+	def elements(self):
+		# every element is one product of transversal elements, one from each level
+		for choice in product(*(transversal.values() for transversal in self.transversals)):
+			element = self.identity
+			for u, _ in choice:
+				element = _compose_images(element, u)
+			yield element
+
+
+class PermutationSet(CoralSet):
+
+	def __init__(self, degree, generators, certainty=30, seed=None):
+		self.degree = degree
+		self.generators = tuple(generators)
+		self.certainty = certainty
+		self.seed = seed
+		self.chain = StabilizerChain(degree, (tuple(g.images) for g in self.generators), certainty, seed)
+		self.order = self.chain.order
+		self.is_infinite = False
+		self._underlying = []
+		self._type_determined = False
+		self._type_cache = {}
+		self._index = None
+		self._predicate = None
+
+	def __repr__(self):
+		return f'{typename(self)}(degree={self.degree}, order={self.order})'
+
+	def __contains__(self, candidate):
+		if not (isinstance(candidate, Permutation) and candidate.degree == self.degree):
+			return False
+		return tuple(candidate.images) in self.chain
+
+	def membership_test(self):
+		return self.__contains__
+
+	def __len__(self):
+		return self.order
+
+	def _size(self):
+		return self.order
+
+	def iter_elements(self):
+		typecode = _typecode(self.degree)
+		for images in self.chain.elements():
+			yield Permutation._of(array(typecode, images))
+
+	def __bool__(self):
+		return True
+
+	def __eq__(self, other):
+		if isinstance(other, PermutationSet):
+			return self.degree == other.degree and self.order == other.order and all(g in self for g in other.generators)
+		return super().__eq__(other)
+
+	def has_subset(self, candidate):
+		if isinstance(candidate, PermutationSet):
+			return candidate.order < self.order and all(g in self for g in candidate.generators)
+		if isinstance(candidate, CoralSet) and not candidate.is_infinite:
+			return candidate._size() < self.order and all(element in self for element in candidate)
+		return super().has_subset(candidate)
+
+
+def _compose(p, q):
+	return p * q
+
+
+def _divide(c, a):
+	# the x with a*x == c
+	return a.inverse() * c
+
+
+class PermutationGroup(Group):
+
+	def __init__(self, *generators, certainty=30, seed=None):
+		if not generators:
+			raise ValueError('Expected at least one generator')
+		if not all(isinstance(g, Permutation) for g in generators):
+			raise TypeError(f'Expected Permutations, not {", ".join(typename(g) for g in generators if not isinstance(g, Permutation))}')
+		degree = generators[0].degree
+		if not all(g.degree == degree for g in generators):
+			raise ValueError('Expected permutations of a single degree')
+		cset = PermutationSet(degree, generators, certainty, seed)
+		binop = GroupOperation(_compose, _divide, cset)
+		# composition of permutations is associative and invertible by construction, and
+		# sampling it would only cost time
+		binop.validation = 'off'
+		super().__init__(cset, Permutation.identity(degree), binop)
+
+	@classmethod
+	def symmetric(cls, degree):
+		if degree < 2:
+			return cls(Permutation.identity(max(degree, 1)))
+		return cls(Permutation.from_cycles(degree, (0, 1)), Permutation.from_cycles(degree, tuple(range(degree))))
+
+	@classmethod
+	def alternating(cls, degree):
+		if degree < 3:
+			return cls(Permutation.identity(max(degree, 1)))
+		return cls(*(Permutation.from_cycles(degree, (0, 1, k)) for k in range(2, degree)))
+
+	def __repr__(self):
+		return f'{typename(self)}(degree={self.degree}, order={self.order})'
+
+	@property
+	def degree(self):
+		return self.cset.degree
+
+	@property
+	def order(self):
+		return self.cset.order
+
+	@property
+	def engine(self):
+		# only the algorithms that need every element enumerate them
+		if self._engine is None:
+			self._engine = Group(CoralSet(tuple(self.cset)), self.identity, self.binop).engine
+		return self._engine
+
+	def element_order(self, x):
+		if x not in self.cset:
+			raise ValueError(f'{x} is not in the group')
+		return x.order
+
+	def generators(self):
+		return self.cset.generators
+
+	def generate(self, *generators):
+		for g in generators:
+			if g not in self.cset:
+				raise ValueError(f'{g} is not in the group')
+		return PermutationGroup(*(generators or (self.identity,)), certainty=self.cset.certainty, seed=self.cset.seed)
+
+	def is_normal_subgroup(self, subgroup):
+		if not isinstance(subgroup, PermutationGroup):
+			return super().is_normal_subgroup(subgroup)
+		if not all(h in self.cset for h in subgroup.generators()):
+			return False
+		return all(g * h * g.inverse() in subgroup.cset for g in self.generators() for h in subgroup.generators())
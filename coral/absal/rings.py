@@ -1,11 +1,13 @@
 
 import itertools
+from math import gcd
 
 from .commute import identity_element_is_valid
 from .groups import Group
 from coral.utils import typename
-from coral.coralset import CoralSet, CustomCoralSet
-from coral.maps import PropertyError, AbelianGroupOperation, AssociativeOperation, InvertibleOperation
+from coral.coralset import CoralSet, CoralRange, CustomCoralSet
+from coral.maps import Function, DomainError, ClosureError, PropertyError, AbelianGroupOperation, AssociativeOperation, InvertibleOperation, multiplication_mod
+from coral import axioms
 
 class Ring:
     
@@ -59,6 +61,149 @@ class DivisionRing(UnitalRing):
         super().__init__(cset, group_addition, additive_identity, multiplication, multiplicative_identity)
 
 
+class FiniteRing(Ring):
+
+    def __init__(self, cset, group_addition, additive_identity, multiplication, closed_form=False):
+        super().__init__(cset, group_addition, additive_identity, multiplication)
+        if self.is_infinite:
+            raise ValueError(f'Expected a finite set of elements, not {cset}')
+        if cset._index is None:
+            raise TypeError('Expected a set of hashable elements')
+        self.index = cset._index
+        self.order = len(self.index)
+        # closed forms are known to land in the ring, so their results go unchecked
+        self.closed_form = closed_form
+        self._member = cset.membership_test()
+        # the operations already declare their axioms; sums and products here skip the
+        # per-call sample validation that Ring.add and Ring.mul go through
+        self._add = self._evaluator(self.addition)
+        self._mul = self._evaluator(self.multiplication)
+        self._one = self._units = self._zero_divisors = None
+        self._unit_test = self._zero_divisor_test = None
+
+    @classmethod
+    def integers_mod(cls, n):
+        if not (isinstance(n, int) and n > 0):
+            raise TypeError('Can only take a modulo by a positive integer')
+        addition = AbelianGroupOperation(
+            lambda a, b: (a + b) % n,
+            lambda a, b: (a - b) % n,
+            CoralRange(n)
+        )
+        ring = cls(CoralRange(n), addition, 0, multiplication_mod(n), closed_form=True)
+        ring._one = (1 % n,)
+        # both are settled by one gcd, so neither set is built unless it is asked for; members
+        # such as 5.0 are taken by their place in the range, which is the integer they equal
+        index_of = ring.cset.index_of
+        ring._unit_test = lambda a: gcd(index_of(a), n) == 1
+        ring._zero_divisor_test = lambda a: not a == 0 and gcd(index_of(a), n) > 1
+        return ring
+
+    def __repr__(self):
+        return f'{typename(self)}(order={self.order})'
+
+    def _evaluator(self, operation):
+        if operation.table is not None:
+            return operation._lookup
+        if self.closed_form:
+            return lambda a, b: Function.__call__(operation, a, b)
+        member, cset = self._member, self.cset
+        def evaluate(a, b):
+            result = Function.__call__(operation, a, b)
+            if not member(result):
+                raise ClosureError(f'Operation output {result} is not in the target {cset}')
+            return result
+        return evaluate
+
+    def tabulate(self):
+        for operation in (self.addition, self.multiplication):
+            if operation.table is None:
+                operation.tabulate()
+        self._add = self._evaluator(self.addition)
+        self._mul = self._evaluator(self.multiplication)
+        return self
+
+    def add(self, a, b):
+        return self._add(a, b)
+
+    def mul(self, a, b):
+        return self._mul(a, b)
+
+    def _many(self, operation, left, right):
+        left, right = operation._columns((left, right))
+        if operation.table is not None:
+            lookup = operation._lookup
+            return [lookup(a, b) for a, b in zip(axioms.scalars(left), axioms.scalars(right))]
+        results = operation.map(left, right)
+        if not self.closed_form:
+            violation = self.cset.first_violation(results)
+            if violation is not None:
+                raise ClosureError(f'Operation output {violation[1]} is not in the target {self.cset}')
+        return results
+
+    def add_many(self, left, right):
+        return self._many(self.addition, left, right)
+
+    def mul_many(self, left, right):
+        return self._many(self.multiplication, left, right)
+
+    @property
+    def multiplicative_identity(self):
+        if self._one is None:
+            mul = self._mul
+            self._one = tuple(itertools.islice(
+                (e for e in self.index if all(mul(e, x) == x and mul(x, e) == x for x in self.index)), 1
+            ))
+        return self._one[0] if self._one else None
+
+    def _classify(self):
+        # one pass over every product settles both units and zero divisors
+        one, zero, mul = self.multiplicative_identity, self.additive_identity, self._mul
+        units, zero_divisors = set(), set()
+        for a in self.index:
+            for b in self.index:
+                product = mul(a, b)
+                if one is not None and product == one and mul(b, a) == one:
+                    units.add(a)
+                if product == zero and not (a == zero or b == zero):
+                    zero_divisors.update((a, b))
+        self._units, self._zero_divisors = frozenset(units), frozenset(zero_divisors)
+
+    @property
+    def units(self):
+        if self._units is None:
+            if self._unit_test is not None:
+                self._units = frozenset(filter(self._unit_test, self.index))
+            else:
+                self._classify()
+        return self._units
+
+    @property
+    def zero_divisors(self):
+        if self._zero_divisors is None:
+            if self._zero_divisor_test is not None:
+                self._zero_divisors = frozenset(filter(self._zero_divisor_test, self.index))
+            else:
+                self._classify()
+        return self._zero_divisors
+
+    def _check(self, a):
+        if not self._member(a):
+            raise DomainError(f'Expected element of {self.cset}, not {a}')
+
+    def is_unit(self, a):
+        self._check(a)
+        if self._unit_test is not None:
+            return self._unit_test(a)
+        return a in self.units
+
+    def is_zero_divisor(self, a):
+        self._check(a)
+        if self._zero_divisor_test is not None:
+            return self._zero_divisor_test(a)
+        return a in self.zero_divisors
+
+
 class Ideal:
 
     def __init__(self, cset):
@@ -66,22 +211,20 @@ class Ideal:
             raise TypeError(f'Expected CoralSet, not {typename(cset)}')
         self.cset = cset
 
-    def is_right_ideal_of(self, ring):
+    def is_right_ideal_of(self, ring, by_generators=False):
         if not isinstance(ring, Ring):
             raise TypeError(f'Expected Ring, not {typename(ring)}')
         if self.cset == ring.cset:
             return True
         if not ring.is_infinite:
-            if self.cset.is_infinite:
-                return False
-            return all(ring.mul(r, i) in self.cset for r, i in zip(ring.cset.elements, self.cset.elements) if i != ring.additive_identity)
+            return self._is_finite_ideal_of(ring, ('right',), by_generators)
         for set_like in ring.cset._underlying:
             if isinstance(set_like, CustomCoralSet):
                 if isinstance(self.cset._underlying[0], CustomCoralSet):
                     return set_like.CLOSURE.has_subset(self.cset._underlying[0].CLOSURE)
                 if self.cset.is_infinite:
                     return set_like.CLOSURE.has_subset(self.cset)
-                return all(ring.mul(r, i) in self.cset for r, i in zip(self.cset.elements, self.cset.elements))
+                return all(ring.mul(r, i) in self.cset for r, i in zip(self.cset, self.cset))
             if isinstance(set_like, type) and set_like not in self.cset:
                 return False
             if not isinstance(set_like, type):
@@ -93,27 +236,25 @@ class Ideal:
             return False
         return True
 
-    def is_proper_right_ideal_of(self, ring):
+    def is_proper_right_ideal_of(self, ring, by_generators=False):
         if self.cset == ring.cset:
             return False
-        return self.is_right_ideal_of(ring)
+        return self.is_right_ideal_of(ring, by_generators)
 
-    def is_left_ideal_of(self, ring):
+    def is_left_ideal_of(self, ring, by_generators=False):
         if not isinstance(ring, Ring):
             raise TypeError(f'Expected Ring, not {typename(ring)}')
         if self.cset == ring.cset:
             return True
         if not ring.is_infinite:
-            if self.cset.is_infinite:
-                return False
-            return all(i*r in self.cset for r, i in zip(ring.cset.elements, self.cset.elements) if i != ring.additive_identity)
+            return self._is_finite_ideal_of(ring, ('left',), by_generators)
         for set_like in ring.cset._underlying:
             if isinstance(set_like, CustomCoralSet):
                 if isinstance(self.cset._underlying[0], CustomCoralSet):
                    return set_like.CLOSURE.has_subset(self.cset._underlying[0].CLOSURE)
                 if self.cset.is_infinite:
                     return set_like.CLOSURE.has_subset(self.cset)
-                return all(ring.mul(i, r) in self.cset for r, i in zip(self.cset.elements, self.cset.elements))
+                return all(ring.mul(i, r) in self.cset for r, i in zip(self.cset, self.cset))
             if isinstance(set_like, type) and set_like not in self.cset:
                 return False
             if not isinstance(set_like, type):
@@ -125,17 +266,94 @@ class Ideal:
             return False
         return True
 
-    def is_proper_left_ideal_of(self, ring):
+    def is_proper_left_ideal_of(self, ring, by_generators=False):
         if self.cset == ring.cset:
             return False
-        return self.is_left_ideal_of(ring)
+        return self.is_left_ideal_of(ring, by_generators)
 
-    def is_ideal_of(self, ring):
-        return self.is_right_ideal_of(ring) and self.is_left_ideal_of(ring)
+    def _is_finite_ideal_of(self, ring, sides, by_generators):
+        if self.cset.is_infinite or not ring.cset.all_in(self.cset):
+            return False
+        zero = ring.additive_identity
+        if by_generators:
+            engine = ring.additive_group.engine
+            indices = engine.indices_of(self.cset)
+            if not engine.is_subgroup(indices):
+                return False
+            # products distribute over sums, so additive generators of both sides are enough
+            ring_elements = engine.elements_of(engine.generators())
+            ideal_elements = engine.elements_of(engine.generators(indices))
+        else:
+            # a finite set holding zero and closed under addition is an additive subgroup
+            ideal_elements = [i for i in self.cset if not i == zero]
+            if zero not in self.cset or not _all_in(ring.addition, ideal_elements, ideal_elements, self.cset):
+                return False
+            ring_elements = [r for r in ring.cset if not r == zero]
+        # with a commutative multiplication both sides are the same check
+        if ring.multiplication.COMMUTATIVE:
+            sides = sides[:1]
+        for side in sides:
+            if side == 'right':
+                left, right = ring_elements, ideal_elements
+            else:
+                left, right = ideal_elements, ring_elements
+            if not _all_in(ring.multiplication, left, right, self.cset):
+                return False
+        return True
 
-    def is_proper_ideal_of(self, ring):
-        return self.is_proper_right_ideal_of(ring) and self.is_proper_left_ideal_of(ring)
-    
+    def is_ideal_of(self, ring, by_generators=False):
+        if isinstance(ring, Ring) and not ring.is_infinite and not self.cset == ring.cset:
+            # both sides share one subset and subgroup check
+            return self._is_finite_ideal_of(ring, ('right', 'left'), by_generators)
+        return self.is_right_ideal_of(ring, by_generators) and self.is_left_ideal_of(ring, by_generators)
+
+    def is_proper_ideal_of(self, ring, by_generators=False):
+        return self.is_proper_right_ideal_of(ring, by_generators) and self.is_proper_left_ideal_of(ring, by_generators)
+
+
+# products are computed this many at a time, so that an early failure ends the search early
+_BLOCK = 1 << 16
 
 
+def _native_array(values):
+    array = axioms.as_array(values)
+    return None if array is None or array.dtype == object else array
 
+
+def _all_in(operation, left, right, target):
+    # the operands are already known to be ring elements, so none of the domain checks or
+    # axiom validation of a call to the operation are needed here
+    left, right = list(left), list(right)
+    if not (left and right):
+        return True
+    table = operation.table
+    if table is not None:
+        members = bytearray(table.order)
+        for x in target:
+            members[table.index[x]] = 1
+        n, cells = table.order, table.cells
+        columns = table.indices_of(right)
+        return all(members[cells[i*n + j]] for i in table.indices_of(left) for j in columns)
+    _func = operation._func
+    # one hashed set of the target settles a whole block of products at C speed
+    members = set(target) if target._index is not None else None
+    # exact integer arrays hold Python objects, which numpy only loops over one at a time
+    column = _native_array(right) if operation.accepts_arrays is not False else None
+    rows = max(1, _BLOCK // len(right))
+    for start in range(0, len(left), rows):
+        block = left[start:start + rows]
+        products = None
+        if column is not None:
+            block_column = _native_array(block)
+            if block_column is not None:
+                columns = block_column.repeat(len(right)), column.reshape(1, -1).repeat(len(block), axis=0).ravel()
+                products = axioms.vectorized_map(_func, columns)
+                operation.accepts_arrays = products is not None
+        if products is None:
+            products = [_func(a, b) for a in block for b in right]
+        if members is not None:
+            if not members.issuperset(axioms.scalars(products)):
+                return False
+        elif target.first_violation(products) is not None:
+            return False
+    return True
@@ -1,9 +1,12 @@
 
 from pytest import fixture, raises
 
-from coral.maps import PropertyError, AbelianGroupOperation, addition_mod, REALS
+from itertools import permutations
+
+from coral.maps import PropertyError, AbelianGroupOperation, GroupOperation, addition_mod, REALS
 from coral.coralset import CoralSet
 from .groups import *
+from .lattice import SubgroupLattice
 
 
 @fixture
@@ -22,6 +25,17 @@ def R_additive_group(R_addition):
 def R_multiplicative_group(R_multiplication):
 	return Group(REALS, 1, R_multiplication)
 
+@fixture
+def S3():
+	def compose(p, q):
+		return tuple(p[i] for i in q)
+	def divide(c, a):
+		# the x with compose(a, x) == c
+		position = {image: i for i, image in enumerate(a)}
+		return tuple(position[image] for image in c)
+	elements = CoralSet(tuple(permutations(range(3))))
+	return Group(elements, (0, 1, 2), GroupOperation(compose, divide, elements))
+
 
 class TestGroup:
 
@@ -41,6 +55,11 @@ class TestGroup:
 		assert not Z_mod(3).has_subgroup(Z_mod(30))
 		assert R_additive_group.has_subgroup(Z_mod(40))
 
+	def test_inverse(self, R_additive_group):
+		assert R_additive_group.inverse(2) == -2
+		assert Z_mod(5).inverse(2) == 3
+		assert Z_mod(5).inverse(0) == 0
+
 
 
 class TestZn:
@@ -61,3 +80,106 @@ class TestZn:
 
 
 
+
+
+class TestFiniteGroup:
+
+	def test_order(self, S3):
+		assert Z_mod(12).order == 12
+		assert S3.order == 6
+
+	def test_element_order(self, S3):
+		assert Z_mod(12).element_order(0) == 1
+		assert Z_mod(12).element_order(4) == 3
+		assert Z_mod(12).element_order(5) == 12
+		assert S3.element_order((1, 0, 2)) == 2
+		assert S3.element_order((1, 2, 0)) == 3
+
+	def test_generate(self):
+		assert Z_mod(12).generate(4).cset == CoralSet((0, 4, 8))
+		assert Z_mod(12).generate(8, 6).cset == CoralSet((0, 2, 4, 6, 8, 10))
+		assert Z_mod(12).generate().cset == CoralSet((0,))
+
+	def test_generators(self, S3):
+		assert Z_mod(12).generators() == (1,)
+		assert S3.generate(*S3.generators()).cset == S3.cset
+
+	def test_cosets(self, S3):
+		assert Z_mod(12).left_cosets(Z_mod(12).generate(4)) == [
+			CoralSet((0, 4, 8)), CoralSet((1, 5, 9)), CoralSet((2, 6, 10)), CoralSet((3, 7, 11))
+		]
+		transposition = S3.generate((1, 0, 2))
+		assert len(S3.left_cosets(transposition)) == 3
+		assert not S3.left_cosets(transposition) == S3.right_cosets(transposition)
+
+	def test_cosets_require_a_subgroup(self):
+		Z12 = Z_mod(12)
+		not_a_subgroup = Group(CoralSet((0, 1)), 0, Z12.binop)
+		with raises(ValueError):
+			Z12.left_cosets(not_a_subgroup)
+		with raises(ValueError):
+			Z12.right_cosets(not_a_subgroup)
+		assert not Z12.is_normal_subgroup(not_a_subgroup)
+
+	def test_is_normal_subgroup(self, S3):
+		assert Z_mod(12).is_normal_subgroup(Z_mod(12).generate(3))
+		assert S3.is_normal_subgroup(S3.generate((1, 2, 0)))
+		assert not S3.is_normal_subgroup(S3.generate((1, 0, 2)))
+
+	def test_uses_the_cayley_table(self):
+		Z6 = Z_mod(6)
+		Z6.binop.tabulate()
+		assert Z6.engine.product is Z6.binop.table
+		assert Z6.generate(2).cset == CoralSet((0, 2, 4))
+
+	def test_scales_to_large_groups(self):
+		Z = Z_mod(50000)
+		assert Z.element_order(3) == 50000
+		assert len(Z.left_cosets(Z.generate(10))) == 10
+
+	def test_refuses_infinite_groups(self, R_additive_group):
+		with raises(ValueError):
+			R_additive_group.element_order(1)
+
+
+class TestSubgroupLattice:
+
+	def test_caches_each_pair(self):
+		lattice = SubgroupLattice()
+		Z2, Z6 = Z_mod(2), Z_mod(6)
+		assert lattice.is_subgroup(Z2, Z6)
+		assert lattice.is_subgroup(Z2, Z6)
+		assert (lattice.misses, lattice.hits) == (1, 1)
+
+	def test_answers_transitively(self):
+		lattice = SubgroupLattice()
+		Z3, Z30, Z300 = Z_mod(3), Z_mod(30), Z_mod(300)
+		assert lattice.is_subgroup(Z3, Z30)
+		assert lattice.is_subgroup(Z30, Z300)
+		assert lattice.is_subgroup(Z3, Z300)
+		assert not lattice.is_subgroup(Z300, Z3)
+		assert lattice.misses == 2
+		assert [g.cset for g in lattice.subgroups_of(Z300)] == [Z3.cset, Z30.cset]
+		assert len(lattice.supergroups_of(Z3)) == 2
+
+	def test_records_non_containment(self, R_additive_group, R_multiplicative_group):
+		lattice = SubgroupLattice()
+		assert not lattice.is_subgroup(R_additive_group, R_multiplicative_group)
+		assert not lattice.is_subgroup(R_additive_group, R_multiplicative_group)
+		assert lattice.hits == 1
+
+	def test_forgets_collected_groups(self):
+		lattice = SubgroupLattice()
+		Z4 = Z_mod(4)
+		lattice.is_subgroup(Z_mod(2), Z4)
+		assert len(lattice) == 1
+
+	def test_group_methods_share_the_lattice(self):
+		Z5, Z10 = Z_mod(5), Z_mod(10)
+		before = SUBGROUP_LATTICE.misses
+		assert Z5.is_subgroup(Z10) and Z10.has_subgroup(Z5)
+		assert SUBGROUP_LATTICE.misses == before + 1
+
+	def test_compares_ranges_arithmetically(self):
+		assert Z_mod(10**7).is_subgroup(Z_mod(10**8))
+		assert not Z_mod(10**8).is_subgroup(Z_mod(10**7))
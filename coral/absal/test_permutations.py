@@ -0,0 +1,103 @@
+from itertools import permutations
+from math import factorial
+
+from pytest import raises
+
+from .permutations import *
+
+
+class TestPermutation:
+
+	def test_rejects_non_permutations(self):
+		with raises(ValueError):
+			_ = Permutation((0, 0, 1))
+
+	def test_composes_as_functions(self):
+		swap, cycle = Permutation((1, 0, 2)), Permutation((1, 2, 0))
+		assert (swap * cycle)(0) == swap(cycle(0))
+		assert swap * swap == Permutation.identity(3)
+		assert cycle * cycle.inverse() == Permutation.identity(3)
+
+	def test_is_stored_compactly(self):
+		assert Permutation(range(50)).images.itemsize == 1
+
+	def test_cycles_and_order(self):
+		p = Permutation.from_cycles(6, (0, 1, 2), (3, 4))
+		assert p.cycles() == [(0, 1, 2), (3, 4)]
+		assert p.order == 6
+		assert Permutation.identity(4).order == 1
+
+	def test_hashable(self):
+		assert len({Permutation((1, 0)), Permutation([1, 0])}) == 1
+
+
+class TestPermutationGroup:
+
+	def test_orders_of_small_groups(self):
+		for n in range(1, 7):
+			assert PermutationGroup.symmetric(n).order == factorial(n)
+		assert PermutationGroup.alternating(5).order == 60
+
+	def test_enumerates_elements(self):
+		S4 = PermutationGroup.symmetric(4)
+		assert set(S4.cset) == set(map(Permutation, permutations(range(4))))
+
+	def test_membership(self):
+		A5 = PermutationGroup.alternating(5)
+		assert Permutation.from_cycles(5, (0, 1, 2)) in A5
+		assert Permutation.from_cycles(5, (0, 1)) not in A5
+		assert Permutation.from_cycles(4, (0, 1, 2)) not in A5
+		assert (0, 1, 2) not in A5
+
+	def test_composes_elements(self):
+		S3 = PermutationGroup.symmetric(3)
+		swap = Permutation.from_cycles(3, (0, 1))
+		assert S3(swap, swap) == S3.identity
+		assert S3.inverse(Permutation.from_cycles(3, (0, 1, 2))) == Permutation.from_cycles(3, (2, 1, 0))
+
+	def test_subgroups(self):
+		S8 = PermutationGroup.symmetric(8)
+		dihedral = PermutationGroup(Permutation.from_cycles(8, tuple(range(8))), Permutation((0, 7, 6, 5, 4, 3, 2, 1)))
+		assert dihedral.order == 16
+		assert dihedral.is_subgroup(S8)
+		assert not S8.is_subgroup(dihedral)
+		assert S8.is_normal_subgroup(PermutationGroup.alternating(8))
+		assert not S8.is_normal_subgroup(dihedral)
+
+	def test_generates_only_from_members(self):
+		A4 = PermutationGroup(*PermutationGroup.alternating(4).generators(), certainty=40, seed=3)
+		with raises(ValueError):
+			A4.generate(Permutation.from_cycles(4, (0, 1)))
+		V4 = A4.generate(Permutation.from_cycles(4, (0, 1), (2, 3)), Permutation.from_cycles(4, (0, 2), (1, 3)))
+		assert V4.order == 4
+		assert (V4.cset.certainty, V4.cset.seed) == (40, 3)
+
+	def test_compares_with_finite_sets_by_order(self):
+		S50 = PermutationGroup.symmetric(50)
+		trivial = CoralSet([Permutation.identity(50)])
+		assert not S50.cset == trivial
+		assert not trivial == S50.cset
+		assert list(S50.cset & trivial) == list(trivial & S50.cset) == [Permutation.identity(50)]
+		assert trivial <= S50.cset and S50.cset >= trivial
+		assert not S50.cset <= trivial
+
+	def test_element_order(self):
+		assert PermutationGroup.symmetric(5).element_order(Permutation.from_cycles(5, (0, 1), (2, 3, 4))) == 6
+
+	def test_cosets_of_small_groups(self):
+		S3 = PermutationGroup.symmetric(3)
+		assert len(S3.left_cosets(S3.generate(Permutation.from_cycles(3, (0, 1))))) == 3
+
+	def test_handles_large_symmetric_groups(self):
+		S50, A50 = PermutationGroup.symmetric(50), PermutationGroup.alternating(50)
+		assert S50.order == factorial(50)
+		assert A50.order == factorial(50) // 2
+		assert A50.is_subgroup(S50)
+		assert S50.is_normal_subgroup(A50)
+		assert Permutation.from_cycles(50, (0, 1)) not in A50
+
+	def test_seeded_construction_is_reproducible(self):
+		dihedral = (Permutation.from_cycles(12, tuple(range(12))), Permutation.from_cycles(12, (1, 11), (2, 10), (3, 9), (4, 8), (5, 7)))
+		first = PermutationGroup(*dihedral, seed=1).cset.chain.base
+		assert PermutationGroup(*dihedral, seed=1).cset.chain.base == first
+		assert PermutationGroup(*dihedral, seed=1).order == 24
@@ -1,9 +1,9 @@
 
-from pytest import fixture, raises, skip
+from pytest import fixture, raises, skip, importorskip
 
 from .rings import *
-from coral.coralset import CoralSet, INTEGERS, EVEN_INTEGERS, REALS
-from coral.maps import PropertyError, ClosedOperation, AbelianGroupOperation
+from coral.coralset import CoralSet, CoralRange, INTEGERS, EVEN_INTEGERS, REALS
+from coral.maps import PropertyError, DomainError, ClosureError, ClosedOperation, AbelianGroupOperation
 
 @fixture
 def R_addition():
@@ -43,6 +43,78 @@ class TestRing:
 		assert R_ring.multiplication(5, -3/2) == R_ring.mul(5, -3/2)
 
 
+class TestFiniteRing:
+
+	def test_integers_mod(self):
+		Z12 = FiniteRing.integers_mod(12)
+		assert Z12.add(7, 8) == 3
+		assert Z12.mul(5, 7) == 11
+		assert Z12.multiplicative_identity == 1
+		with raises(DomainError):
+			Z12.add(12, 1)
+
+	def test_units_and_zero_divisors(self):
+		Z12 = FiniteRing.integers_mod(12)
+		assert Z12.units == {1, 5, 7, 11}
+		assert Z12.zero_divisors == {2, 3, 4, 6, 8, 9, 10}
+		assert Z12.is_unit(5) and not Z12.is_unit(0)
+		assert Z12.is_zero_divisor(9) and not Z12.is_zero_divisor(7)
+
+	def test_closed_forms_never_list_their_elements(self):
+		Z = FiniteRing.integers_mod(2**62)
+		assert Z.is_unit(3) and not Z.is_unit(2)
+		assert Z.is_zero_divisor(2**61) and not Z.is_zero_divisor(0)
+		assert Z._units is None and Z._zero_divisors is None
+
+	def test_closed_forms_accept_equal_members(self):
+		Z12 = FiniteRing.integers_mod(12)
+		assert Z12.is_unit(5.0) and not Z12.is_unit(4.0)
+		assert Z12.is_zero_divisor(4.0) and not Z12.is_zero_divisor(5.0) and not Z12.is_zero_divisor(0.0)
+		assert Z12.is_unit(True)
+
+	def test_general_operations_agree_with_closed_forms(self):
+		Z12 = FiniteRing.integers_mod(12)
+		ring = FiniteRing(Z12.cset, Z12.addition, 0, Z12.multiplication)
+		assert ring.multiplicative_identity == 1
+		assert ring.units == Z12.units and ring.zero_divisors == Z12.zero_divisors
+		ring.tabulate()
+		assert ring.add(7, 8) == 3 and ring.mul(5, 7) == 11
+
+	def test_rings_without_identity(self):
+		Z8 = FiniteRing.integers_mod(8)
+		evens = FiniteRing(CoralSet((0, 2, 4, 6)), Z8.addition, 0, Z8.multiplication)
+		assert evens.multiplicative_identity is None
+		assert evens.units == set()
+		assert evens.zero_divisors == {2, 4, 6}
+
+	def test_checks_closure(self, R_addition, R_multiplication):
+		ring = FiniteRing(CoralSet((-1, 0, 1)), R_addition, 0, R_multiplication)
+		assert ring.mul(-1, -1) == 1
+		with raises(ClosureError):
+			ring.add(1, 1)
+		with raises(ClosureError):
+			ring.add_many([0, 1], [1, 1])
+
+	def test_batched_arithmetic(self):
+		Z7 = FiniteRing.integers_mod(7)
+		assert Z7.add_many([1, 2, 3], [6, 6, 6]) == [0, 1, 2]
+		assert Z7.mul_many(range(7), [3]*7) == [0, 3, 6, 2, 5, 1, 4]
+		Z7.tabulate()
+		assert Z7.mul_many(range(7), [3]*7) == [0, 3, 6, 2, 5, 1, 4]
+		with raises(ValueError):
+			Z7.add_many([1, 2], [3])
+
+	def test_batched_arithmetic_over_arrays(self):
+		numpy = importorskip('numpy')
+		Z = FiniteRing.integers_mod(10**6)
+		products = Z.mul_many(numpy.arange(1000), numpy.arange(1000))
+		assert products[999] == 998001
+
+	def test_refuses_infinite_rings(self, R_addition, R_multiplication):
+		with raises(ValueError):
+			FiniteRing(INTEGERS, R_addition, 0, R_multiplication)
+
+
 class TestIdeal:
 
 	def test_requires_specification_of_cset(self):
@@ -69,3 +141,32 @@ class TestIdeal:
 		assert not whole_ring_ideal.is_proper_ideal_of(Z_ring)
 
 
+
+	def test_checks_every_product_in_finite_rings(self):
+		Z12 = FiniteRing.integers_mod(12)
+		assert Ideal(CoralSet((0, 4, 8))).is_ideal_of(Z12)
+		assert Ideal(CoralSet((0, 2, 4, 6, 8, 10))).is_proper_ideal_of(Z12)
+		# pairing ring and ideal elements one to one would miss 3*1 == 3
+		assert not Ideal(CoralSet((0, 1, 6))).is_right_ideal_of(Z12)
+		assert not Ideal(CoralSet((0, 3, 6))).is_ideal_of(Z12)
+		assert not Ideal(CoralSet((0, 4, 12))).is_ideal_of(Z12)
+
+	def test_checks_by_generators(self):
+		Z12 = FiniteRing.integers_mod(12)
+		for elements in ((0, 4, 8), (0, 6), (0, 3, 6), (0, 1, 6), (0, 4)):
+			ideal = Ideal(CoralSet(elements))
+			assert ideal.is_ideal_of(Z12, by_generators=True) == ideal.is_ideal_of(Z12)
+
+	def test_checks_tabulated_rings(self):
+		Z12 = FiniteRing.integers_mod(12).tabulate()
+		assert Ideal(CoralSet((0, 3, 6, 9))).is_left_ideal_of(Z12)
+		assert not Ideal(CoralSet((0, 1, 6))).is_left_ideal_of(Z12)
+
+	def test_checks_general_finite_rings(self, R_addition, R_multiplication):
+		ring = Ring(CoralSet((-1, 0, 1)), R_addition, 0, R_multiplication)
+		assert Ideal(CoralSet((0,))).is_ideal_of(ring)
+
+	def test_scales_to_large_rings(self):
+		Z = FiniteRing.integers_mod(3000)
+		assert Ideal(CoralRange(0, 3000, 3)).is_ideal_of(Z, by_generators=True)
+		assert not Ideal(CoralSet((*range(0, 3000, 3), 1))).is_ideal_of(Z)
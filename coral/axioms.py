@@ -0,0 +1,247 @@
+import itertools
+import random
+import time
+
+from .utils import typename
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+# below this many samples the cost of building arrays outweighs the per-tuple savings
+VECTORIZATION_THRESHOLD = 8
+
+
+def blocks_involving(old, new, length, everything=None):
+	if everything is None:
+		everything = (*old, *new)
+	# the products of the blocks partition every tuple containing a new element, keyed
+	# on the position of its first new element
+	for position in range(length):
+		yield (old,) * position + (new,) + (everything,) * (length - position - 1)
+
+
+def tuples_involving(old, new, length):
+	for block in blocks_involving(tuple(old), tuple(new), length):
+		yield from itertools.product(*block)
+
+
+def pairs_involving(old, new):
+	# unordered pairs of distinct elements, for axioms that are symmetric in their arguments
+	new = tuple(new)
+	yield from itertools.product(old, new)
+	yield from itertools.combinations(new, 2)
+
+
+def memoized(op):
+	cache = {}
+	def memoized_op(a, b):
+		try:
+			return cache[a, b]
+		except KeyError:
+			result = cache[a, b] = op(a, b)
+			return result
+		except TypeError:
+			# unhashable operands are simply recomputed
+			return op(a, b)
+	return memoized_op
+
+
+class RandomSampling:
+
+	def __init__(self, checks=1000, seed=None, time_budget=None):
+		if not (isinstance(checks, int) and checks > 0):
+			raise ValueError(f'Expected a positive number of checks, not {checks}')
+		if time_budget is not None and not (isinstance(time_budget, (int, float)) and time_budget > 0):
+			raise ValueError(f'Expected a positive time budget in seconds, not {time_budget}')
+		self.checks = checks
+		self.seed = seed
+		self.time_budget = time_budget
+		self.rng = random.Random(seed)
+		self.last_checked = 0
+		self.last_exhaustive = False
+		# the latest round drawn for each axiom, as [tuples drawn, whether that was all of them]
+		self.rounds = {}
+
+	def __repr__(self):
+		return f'{typename(self)}(checks={self.checks}, seed={self.seed}, time_budget={self.time_budget})'
+
+	def tuples(self, samples, length, axiom=None):
+		samples = tuple(samples)
+		# a tuple space no larger than the budget is cheaper to enumerate outright
+		exhaustive = len(samples) ** length <= self.checks
+		self.last_checked, self.last_exhaustive = 0, exhaustive
+		drawn = self.rounds[axiom] = [0, exhaustive]
+		if exhaustive:
+			for candidate in itertools.product(samples, repeat=length):
+				self.last_checked += 1
+				drawn[0] += 1
+				yield candidate
+			return
+		deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+		for _ in range(self.checks):
+			if deadline is not None and time.perf_counter() > deadline:
+				return
+			self.last_checked += 1
+			drawn[0] += 1
+			yield tuple(self.rng.choice(samples) for _ in range(length))
+
+	def error_bound(self, violation_rate, axiom=None):
+		# the chance that a round passed even though at least violation_rate of all tuples break
+		# its axiom, since each independent draw misses them with 1 - violation_rate
+		if not 0 <= violation_rate <= 1:
+			raise ValueError(f'Expected a violation rate between 0 and 1, not {violation_rate}')
+		if axiom is not None:
+			if axiom not in self.rounds:
+				raise ValueError(f'No round has been drawn for {axiom}')
+			checked, exhaustive = self.rounds[axiom]
+			return 0.0 if exhaustive else (1 - violation_rate) ** checked
+		# every axiom at once is only as certain as the least checked of them
+		return max((self.error_bound(violation_rate, axiom) for axiom in self.rounds), default=1.0)
+
+
+def associativity_counterexample(op, triples):
+	for a, b, c in triples:
+		if not op(op(a, b), c) == op(a, op(b, c)):
+			return a, b, c
+	return None
+
+
+def commutativity_counterexample(op, pairs):
+	for a, b in pairs:
+		if not op(a, b) == op(b, a):
+			return a, b
+	return None
+
+
+def left_invertibility_counterexample(op, inverse, pairs):
+	for a, b in pairs:
+		if not b == inverse(op(a, b), a):
+			return a, b
+	return None
+
+
+def right_invertibility_counterexample(op, inverse, pairs):
+	for a, b in pairs:
+		if not a == inverse(op(a, b), b):
+			return a, b
+	return None
+
+
+def latin_square_counterexample(op, samples, singletons):
+	# each sample's row and column are checked on their own, so they can be sharded like tuples
+	for (a,) in singletons:
+		row, column = set(), set()
+		for s in samples:
+			product = op(a, s)
+			if product in row:
+				return a, s
+			row.add(product)
+			product = op(s, a)
+			if product in column:
+				return s, a
+			column.add(product)
+	return None
+
+
+def as_array(samples):
+	if numpy is None:
+		return None
+	samples = tuple(samples)
+	if not all(isinstance(sample, (int, float, complex)) for sample in samples):
+		return None
+	# integers stay exact Python objects so that array arithmetic cannot silently overflow
+	if any(isinstance(sample, int) for sample in samples):
+		return numpy.array(samples, dtype=object)
+	return numpy.array(samples)
+
+
+def _item(value):
+	return value.item() if isinstance(value, numpy.generic) else value
+
+
+def _evaluate(op, x, y):
+	result = numpy.asarray(op(x, y))
+	return numpy.broadcast_to(result, numpy.broadcast_shapes(numpy.shape(x), numpy.shape(y)))
+
+
+def _equal(x, y):
+	return numpy.asarray(x == y, dtype=bool)
+
+
+def is_array(values):
+	return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def exact(array):
+	# fixed-width integers wrap around without raising, so they are computed on as Python ints
+	return array.astype(object) if array.dtype.kind in 'biu' else array
+
+
+def scalars(values):
+	return values.tolist() if is_array(values) else values
+
+
+def vectorized_map(op, columns):
+	# None unless op evaluates the columns elementwise, as checked against a few scalar rows
+	try:
+		with numpy.errstate(all='raise'):
+			results = numpy.asarray(op(*columns))
+		if not results.shape == columns[0].shape:
+			return None
+		probe = zip(*(column[:4].tolist() for column in columns))
+		if not all(_item(results[i]) == op(*row) for i, row in enumerate(probe)):
+			return None
+	except Exception:
+		return None
+	return results
+
+
+def accepts_arrays(op, samples):
+	probe = tuple(samples)[:4]
+	X = as_array(probe)
+	if X is None:
+		return False
+	try:
+		with numpy.errstate(all='raise'):
+			grid = _evaluate(op, X[:, None], X[None, :])
+		return all(
+			_item(grid[i, j]) == op(a, b)
+			for i, a in enumerate(probe) for j, b in enumerate(probe)
+		)
+	except Exception:
+		return False
+
+
+def vectorized_associativity_counterexample(op, blocks):
+	with numpy.errstate(all='raise'):
+		for X, Y, Z in blocks:
+			if not (len(X) and len(Y) and len(Z)):
+				continue
+			YZ = _evaluate(op, Y[:, None], Z[None, :])
+			# one slab of the triple grid at a time keeps memory quadratic in the sample size
+			for x in X:
+				left = _evaluate(op, _evaluate(op, x, Y)[:, None], Z[None, :])
+				right = _evaluate(op, x, YZ)
+				failures = numpy.argwhere(~_equal(left, right))
+				if len(failures):
+					j, k = failures[0]
+					return _item(x), _item(Y[j]), _item(Z[k])
+	return None
+
+
+def vectorized_commutativity_counterexample(op, blocks):
+	with numpy.errstate(all='raise'):
+		for X, Y in blocks:
+			if not (len(X) and len(Y)):
+				continue
+			forward = _evaluate(op, X[:, None], Y[None, :])
+			backward = _evaluate(op, Y[None, :], X[:, None])
+			mask = ~_equal(X[:, None], Y[None, :])
+			failures = numpy.argwhere(mask & ~_equal(forward, backward))
+			if len(failures):
+				i, j = failures[0]
+				return _item(X[i]), _item(Y[j])
+	return None
@@ -1,5 +1,22 @@
 
-from .utils import typename, chain
+from itertools import chain as lazy_chain
+from collections.abc import Mapping
+from weakref import WeakValueDictionary, ref
+
+from .utils import typename
+from .predicates import Predicate, Type, Interval, Congruence, Members
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _type_determined(set_like):
+    # only plain classes, or sets that say so, decide membership on nothing but the candidate's type
+    if not isinstance(set_like, type):
+        return False
+    return type(set_like) is type or getattr(set_like, 'TYPE_DETERMINED', False) is True
 
 
 class CoralSet:
@@ -9,29 +26,173 @@ class CoralSet:
             raise TypeError('All set elements must have an equality measure')
         self.is_infinite = any(isinstance(sub_set_like, type) for sub_set_like in set_like)
         self._underlying = set_like if self.is_infinite else list(set_like)
+        # membership in a union of plain types depends on nothing but the candidate's type
+        self._type_determined = self.is_infinite and all(map(_type_determined, set_like))
+        self._type_cache = {}
+        self._index = None if self.is_infinite else self._build_index()
+        self._predicate = self._build_predicate() if self.is_infinite else None
+
+    def _build_predicate(self):
+        # an infinite set whose every part has a predicate can be reasoned about symbolically
+        predicate = Predicate()
+        for sub_set_like in self._underlying:
+            if isinstance(sub_set_like, CustomCoralSet):
+                part = sub_set_like.PREDICATE
+            elif isinstance(sub_set_like, type):
+                # a metaclass may judge instances by value, which no type clause can describe
+                part = Type(sub_set_like) if _type_determined(sub_set_like) else None
+            else:
+                try:
+                    part = Members(*sub_set_like)
+                except TypeError:
+                    part = None
+            if part is None:
+                return None
+            predicate = predicate | part
+        return predicate
+
+    def _build_index(self):
+        # maps each distinct element to its position in order of first appearance
+        index = {}
+        try:
+            for element in lazy_chain.from_iterable(self._underlying):
+                index.setdefault(element, len(index))
+        except TypeError:
+            # sets holding unhashable elements fall back to scanning
+            return None
+        return index
 
     def __repr__(self):
         return f'CoralSet{tuple(self._underlying)}'
 
     @property
     def elements(self):
+        return tuple(self.iter_elements())
+
+    def iter_elements(self):
         if self.is_infinite:
             raise ValueError(f'Cannot list all elements of an infinite set')
-        return chain(*self._underlying)
+        if self._index is not None:
+            return iter(self._index)
+        return self._iter_unhashable()
+
+    def _iter_unhashable(self):
+        seen = []
+        for element in lazy_chain.from_iterable(self._underlying):
+            if element not in seen:
+                seen.append(element)
+                yield element
+
+    def __iter__(self):
+        return self.iter_elements()
+
+    def __len__(self):
+        if self.is_infinite:
+            raise ValueError(f'Cannot count the elements of an infinite set')
+        if self._index is not None:
+            return len(self._index)
+        return sum(1 for _ in self._iter_unhashable())
+
+    def _size(self):
+        # the set operations count through here, so sets too large for len() can still take part
+        return len(self)
+
+    def __bool__(self):
+        return self.is_infinite or any(True for _ in self.iter_elements())
 
     def __eq__(self, other):
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, CoralSet):
             return False
         # both sets are infinite
         if self.is_infinite and other.is_infinite:
+            if self._predicate is not None and other._predicate is not None:
+                below, above = self._predicate.subset_of(other._predicate), other._predicate.subset_of(self._predicate)
+                if below is False or above is False:
+                    return False
+                if below and above:
+                    return True
             return all(item in other._underlying for item in self._underlying)
         # one of the two sets are infinite
         if self.is_infinite or other.is_infinite:
             return False
         # both sets are finite
-        return set(*self._underlying) == set(*other._underlying)
+        return self._size() == other._size() and all(element in other for element in self)
         
+    def membership_test(self):
+        if self._type_determined:
+            return self._contains_type_of
+        if self._predicate is not None:
+            return self._predicate.test
+        if self._index is not None:
+            return self._contains_hashed
+        return self.__contains__
+
+    def index_of(self, candidate):
+        if self.is_infinite:
+            raise ValueError(f'Cannot index the elements of an infinite set')
+        if self._index is None:
+            raise TypeError(f'Cannot index a set of unhashable elements')
+        try:
+            return self._index[candidate]
+        except (KeyError, TypeError):
+            raise ValueError(f'{candidate} is not in {self}') from None
+
+    def _contains_hashed(self, candidate):
+        try:
+            return candidate in self._index
+        except TypeError:
+            return self._contains(candidate)
+
+    def _contains_type_of(self, candidate):
+        try:
+            return self._type_cache[type(candidate)]
+        except KeyError:
+            result = self._type_cache[type(candidate)] = self._contains(candidate)
+            return result
+
     def __contains__(self, candidate):
+        if self._type_determined:
+            return self._contains_type_of(candidate)
+        if self._predicate is not None:
+            return self._predicate.test(candidate)
+        if self._index is not None:
+            return self._contains_hashed(candidate)
+        return self._contains(candidate)
+
+    def contains_many(self, values):
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            mask = self._mask(values)
+            if mask is None:
+                is_member = self.membership_test()
+                flat = values.ravel().tolist()
+                mask = numpy.fromiter(map(is_member, flat), dtype=bool, count=len(flat)).reshape(values.shape)
+            return mask
+        return list(map(self.membership_test(), values))
+
+    def _mask(self, array):
+        if self._predicate is None:
+            return None
+        return self._predicate.mask(array)
+
+    def first_violation(self, values):
+        # the position and value of the first candidate outside the set, or None if there is none
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            values = values.ravel()
+            failures = numpy.flatnonzero(~self.contains_many(values))
+            if not len(failures):
+                return None
+            position = int(failures[0])
+            return position, values[position:position + 1].tolist()[0]
+        is_member = self.membership_test()
+        for position, value in enumerate(values):
+            if not is_member(value):
+                return position, value
+        return None
+
+    def all_in(self, values):
+        return self.first_violation(values) is None
+
+    def _contains(self, candidate):
         if self.is_infinite:
             for sub_set_like in self._underlying:
                 if isinstance(sub_set_like, type) and isinstance(candidate, sub_set_like):
@@ -41,20 +202,88 @@ class CoralSet:
             return False
         return any(candidate in subset for subset in self._underlying)
 
+    def _finite(self, elements):
+        return CoralSet(tuple(elements))
+
+    def _smaller_first(self, other):
+        return (self, other) if self._size() <= other._size() else (other, self)
+
     def __or__(self, other):
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, CoralSet):
             raise TypeError(f'Expected {typename(self)}, not {typename(other)}')
         # both sets are finite
         if not any([self.is_infinite, other.is_infinite]):
-            return self.__class__(chain(*self._underlying, *other._underlying))
-        # both sets are infinite
+            return self._finite(lazy_chain(self, (element for element in other if element not in self)))
+        return CoralSet(*self._underlying, *other._underlying)
+
+    def __and__(self, other):
+        if not isinstance(other, CoralSet):
+            raise TypeError(f'Expected {typename(self)}, not {typename(other)}')
         if self.is_infinite and other.is_infinite:
-            return self.__class__(*self._underlying, *other._underlying)
-        return self.__class__(*self._underlying, *other._underlying)
+            raise ValueError(f'Cannot intersect two infinite sets')
+        # only the smaller finite set is walked, each element costing one lookup in the other
+        if self.is_infinite or other.is_infinite:
+            smaller, larger = (other, self) if self.is_infinite else (self, other)
+        else:
+            smaller, larger = self._smaller_first(other)
+        return self._finite(element for element in smaller if element in larger)
+
+    def __sub__(self, other):
+        if not isinstance(other, CoralSet):
+            raise TypeError(f'Expected {typename(self)}, not {typename(other)}')
+        if self.is_infinite:
+            raise ValueError(f'Cannot take the difference of an infinite set')
+        return self._finite(element for element in self if element not in other)
+
+    def __xor__(self, other):
+        if not isinstance(other, CoralSet):
+            raise TypeError(f'Expected {typename(self)}, not {typename(other)}')
+        if self.is_infinite or other.is_infinite:
+            raise ValueError(f'Cannot take the symmetric difference of an infinite set')
+        return self._finite(lazy_chain(
+            (element for element in self if element not in other),
+            (element for element in other if element not in self)
+        ))
+
+    def __le__(self, other):
+        if not isinstance(other, CoralSet):
+            return NotImplemented
+        if not any([self.is_infinite, other.is_infinite]):
+            return self._size() <= other._size() and all(element in other for element in self)
+        return self == other or other.has_subset(self)
+
+    def __lt__(self, other):
+        if not isinstance(other, CoralSet):
+            return NotImplemented
+        return other.has_subset(self)
+
+    def __ge__(self, other):
+        if not isinstance(other, CoralSet):
+            return NotImplemented
+        # calling <= would hand a subclass on the right straight back to this method
+        return type(other).__le__(other, self)
+
+    def __gt__(self, other):
+        if not isinstance(other, CoralSet):
+            return NotImplemented
+        return self.has_subset(other)
 
     def has_subset(self, candidate):
         if not isinstance(candidate, CoralSet):
             raise TypeError(f'Expected {typename(self)}, not {typename(candidate)}')
+        # a proper subset of a finite set is smaller, which settles most candidates before any lookup
+        if not any([self.is_infinite, candidate.is_infinite]):
+            return candidate._size() < self._size() and all(element in self for element in candidate)
+        if self._predicate is not None and candidate._predicate is not None:
+            below = candidate._predicate.subset_of(self._predicate)
+            if below is False:
+                return False
+            above = self._predicate.subset_of(candidate._predicate)
+            # a symbolic question left undecided goes on to the checks below
+            if below and above is not None:
+                return not above
+        if self._predicate is not None and not candidate.is_infinite:
+            return all(map(self._predicate.test, candidate))
         # ensures this method only implements a PROPER subset
         if self == candidate:
             return False
@@ -85,32 +314,234 @@ class CoralSet:
                 for sub_set_like in candidate._underlying
             )
         # if candidate is infinite and self is finite
-        if candidate.is_infinite:
-            return False
-        # if both sets are finite
-        return (self | candidate) == self
+        return False
 
     def is_subset(self, candidate):
         if not isinstance(candidate, CoralSet):
             raise TypeError(f'Expected {typename(self)}, not {typename(candidate)}')
         return candidate.has_subset(self)
 
+    def frozen(self):
+        return FrozenCoralSet(*self._underlying)
 
-COMPLEX = CoralSet(int) | CoralSet(float) | CoralSet(complex)
+
+def _as_integer(candidate):
+    if isinstance(candidate, int):
+        return candidate
+    # anything equal to an integer, like 2.0, is the same set element as that integer
+    try:
+        integer = int(candidate)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return integer if integer == candidate else None
+
+
+def _ascending(integers):
+    return integers if integers.step > 0 else integers[::-1]
+
+
+def _covers(outer, inner):
+    outer, inner = _ascending(outer), _ascending(inner)
+    if not inner:
+        return True
+    if not (inner[0] in outer and inner[-1] in outer):
+        return False
+    # every step of inner lands back on outer only if it is a whole number of outer steps
+    return len(inner) == 1 or inner.step % outer.step == 0
+
+
+class _RangeIndex(Mapping):
+
+    def __init__(self, integers):
+        self._range = integers
+
+    def __getitem__(self, candidate):
+        integer = _as_integer(candidate)
+        if integer is None or integer not in self._range:
+            raise KeyError(candidate)
+        return self._range.index(integer)
+
+    def __contains__(self, candidate):
+        integer = _as_integer(candidate)
+        return integer is not None and integer in self._range
+
+    def __iter__(self):
+        return iter(self._range)
+
+    def __len__(self):
+        return len(self._range)
+
+
+class CoralRange(CoralSet):
+
+    def __init__(self, *bounds):
+        # the range is kept as is, so nothing here ever enumerates its elements
+        self._range = range(*bounds)
+        self.is_infinite = False
+        self._underlying = [self._range]
+        self._type_determined = False
+        self._type_cache = {}
+        self._index = _RangeIndex(self._range)
+        self._predicate = None
+
+    def __repr__(self):
+        return f'{typename(self)}({self._range.start}, {self._range.stop}, {self._range.step})'
+
+    def __len__(self):
+        return len(self._range)
+
+    def membership_test(self):
+        return self._index.__contains__
+
+    def _mask(self, array):
+        kind = array.dtype.kind
+        if kind not in 'biuf':
+            return numpy.zeros(array.shape, dtype=bool) if kind == 'c' else None
+        integers = _ascending(self._range)
+        if not integers:
+            return numpy.zeros(array.shape, dtype=bool)
+        try:
+            with numpy.errstate(invalid='ignore'):
+                mask = (array >= integers[0]) & (array <= integers[-1]) & ((array - integers[0]) % integers.step == 0)
+        except (OverflowError, TypeError):
+            return None
+        if kind == 'f':
+            mask &= array == numpy.floor(array)
+        return mask
+
+    def __contains__(self, candidate):
+        return candidate in self._index
+
+    def __eq__(self, other):
+        if isinstance(other, CoralRange):
+            return len(self._range) == len(other._range) and _covers(self._range, other._range)
+        return super().__eq__(other)
+
+    def __or__(self, other):
+        if isinstance(other, CoralRange):
+            if not self._range:
+                return other
+            if not other._range:
+                return self
+            first, second = sorted((_ascending(self._range), _ascending(other._range)), key=lambda r: r[0])
+            step = first.step if len(first) > 1 else second.step
+            if len(second) > 1 and not second.step == step:
+                step = None
+            # aligned ranges with the same step that overlap or touch merge into one range
+            if step is not None and (second[0] - first[0]) % step == 0 and second[0] <= first[-1] + step:
+                return CoralRange(first[0], max(first[-1], second[-1]) + 1, step)
+        return super().__or__(other)
+
+    def has_subset(self, candidate):
+        if isinstance(candidate, CoralRange):
+            return _covers(self._range, candidate._range) and len(candidate._range) < len(self._range)
+        return super().has_subset(candidate)
+
+
+class FrozenCoralSet(CoralSet):
+
+    # structurally identical sets share one instance for as long as any of them is in use
+    _interned = WeakValueDictionary()
+
+    def __new__(cls, *set_like):
+        candidate = super().__new__(cls)
+        CoralSet.__init__(candidate, *set_like)
+        key = candidate._structure()
+        interned = cls._interned.get(key)
+        if interned is not None:
+            return interned
+        candidate._underlying = tuple(candidate._underlying)
+        candidate._key = key
+        # the same infinite set can be written with different types, so those all share a hash
+        candidate._hash = hash(FrozenCoralSet) if candidate.is_infinite else hash(key[1])
+        candidate._relations = {}
+        candidate._frozen = True
+        cls._interned[key] = candidate
+        return candidate
+
+    def __init__(self, *set_like):
+        # everything was settled in __new__, which may have handed back an existing instance
+        ...
+
+    def _structure(self):
+        types, elements = [], []
+        for sub_set_like in self._underlying:
+            if isinstance(sub_set_like, type):
+                types.append(sub_set_like)
+            else:
+                elements.extend(sub_set_like)
+        try:
+            return frozenset(types), frozenset(elements)
+        except TypeError:
+            raise TypeError(f'Cannot freeze a set of unhashable elements') from None
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f'{typename(self)} is immutable')
+        super().__setattr__(name, value)
+
+    def __repr__(self):
+        return f'{typename(self)}{tuple(self._underlying)}'
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return FrozenCoralSet, tuple(self._underlying)
+
+    def frozen(self):
+        return self
+
+    def _related(self, relation, other, decide):
+        # interned sets never change, so each relation between a pair only has to be decided once;
+        # entries are keyed by identity, since looking them up by equality would recurse into here
+        if not isinstance(other, FrozenCoralSet):
+            return decide(other)
+        entry = self._relations.get((relation, id(other)))
+        if entry is not None and entry[0]() is other:
+            return entry[1]
+        result = decide(other)
+        self._relations[relation, id(other)] = (ref(other), result)
+        return result
+
+    def __eq__(self, other):
+        # sets written out alike are one instance, but sets written differently may still be equal
+        if self is other:
+            return True
+        return self._related('eq', other, super().__eq__)
+
+    def has_subset(self, candidate):
+        return self._related('has_subset', candidate, super().has_subset)
+
+    def __le__(self, other):
+        return self._related('le', other, super().__le__)
+
+    def _finite(self, elements):
+        return FrozenCoralSet(tuple(elements))
+
+    def __or__(self, other):
+        return super().__or__(other).frozen()
 
 
 class CustomCoralSet(type):
     CLOSURE = tuple()
+    # whether isinstance checks against the set depend only on the candidate's type
+    TYPE_DETERMINED = False
+    PREDICATE = None
+
+    def __instancecheck__(cls, instance):
+        if cls.PREDICATE is None:
+            return super().__instancecheck__(instance)
+        return cls.PREDICATE.test(instance)
+
+
+COMPLEX = CoralSet(int) | CoralSet(float) | CoralSet(complex)
 
 
 class _RealLocusMeta(CustomCoralSet):
 
     CLOSURE = COMPLEX
-
-    def __instancecheck__(cls, instance):
-        if isinstance(instance, (int, float)):
-            return True
-        return isinstance(instance, complex) and instance.imag == 0
+    PREDICATE = Type(int, float) | (Type(complex) & Interval())
 
 
 class _RealLocus(metaclass=_RealLocusMeta):
@@ -123,9 +554,7 @@ REALS = CoralSet(_RealLocus)
 class _PositiveRealsMeta(CustomCoralSet):
 
     CLOSURE = CoralSet(int) | CoralSet(float)
-
-    def __instancecheck__(cls, instance):
-        return isinstance(instance, (int, float)) and instance > 0
+    PREDICATE = Type(int, float) & Interval(0, low_closed=False)
 
 
 class _PositiveReals(metaclass=_PositiveRealsMeta):
@@ -138,9 +567,8 @@ POSITIVE_REALS = CoralSet(_PositiveReals)
 class _IntegersMeta(CustomCoralSet):
 
     CLOSURE = CoralSet(int) | CoralSet(float)
-
-    def __instancecheck__(cls, instance):
-        return isinstance(instance, int)
+    TYPE_DETERMINED = True
+    PREDICATE = Type(int)
 
 
 class _Integers(metaclass=_IntegersMeta):
@@ -153,9 +581,7 @@ INTEGERS = CoralSet(_Integers)
 class _EvenIntegersMeta(CustomCoralSet):
 
     CLOSURE = CoralSet(int)
-
-    def __instancecheck__(cls, instance):
-        return isinstance(instance, int) and (instance % 2 == 0)
+    PREDICATE = Congruence(2)
 
 
 class _EvenIntegers(metaclass=_EvenIntegersMeta):
@@ -1,28 +1,57 @@
 
-from inspect import signature
+from inspect import signature, Parameter
+from types import FunctionType
 from collections.abc import Sequence
+from contextlib import contextmanager
 import itertools
+from array import array
 
-from .coralset import CoralSet, REALS, COMPLEX
+from .coralset import CoralSet, CoralRange, REALS, COMPLEX
 from .utils import typename
+from .tables import CayleyTable, _typecode
+from .samples import SampleCache
+from . import axioms
+from .parallel import ProcessPoolVerification
+
+
+# arities keyed on code objects, so every closure made by a factory like addition_mod
+# shares one signature analysis
+_arities = {}
+
+_KEYWORD_KINDS = (Parameter.KEYWORD_ONLY, Parameter.VAR_KEYWORD)
+
+
+def _arity(_func):
+	key = None
+	# wrapped or re-signed functions do not have the signature their code suggests
+	if type(_func) is FunctionType and not hasattr(_func, '__wrapped__') and not hasattr(_func, '__signature__'):
+		key = (_func.__code__, len(_func.__defaults__ or ()), tuple(_func.__kwdefaults__ or ()))
+		if key in _arities:
+			return _arities[key]
+	parameters = signature(_func).parameters.values()
+	kwargs = sum(1 for p in parameters if p.kind in _KEYWORD_KINDS or p.default is not Parameter.empty)
+	arity = (len(parameters) - kwargs, kwargs)
+	if key is not None:
+		_arities[key] = arity
+	return arity
 
 
 def has_kwargs(_func):
 	if not callable(_func):
 		raise TypeError(f'Expected Callable, not {typename(_func)}')
-	return '=' in str(signature(_func))
+	return _arity(_func)[1] > 0
 
 
 def num_kwargs(_func):
 	if not callable(_func):
 		raise TypeError(f'Expected Callable, not {typename(_func)}')
-	return str(signature(_func)).count('=')
+	return _arity(_func)[1]
 
 
 def num_args(_func):
 	if not callable(_func):
 		raise TypeError(f'Expected Callable, not {typename(_func)}')
-	return len(signature(_func).parameters) - num_kwargs(_func)
+	return _arity(_func)[0]
 
 
 class DomainError(ValueError):
@@ -57,13 +86,40 @@ class Function:
 			raise TypeError(f'Must specify input domains to the proper number of dimensions')
 		self._func = _func
 		self.input_domains = tuple(input_domains)
+		self._domain_tests = tuple(domain.membership_test() for domain in self.input_domains)
+		self.accepts_arrays = None
 
 	def __call__(self, *args):
-		for arg, domain in zip(args, self.input_domains):
-			if arg not in domain:
+		for arg, is_member, domain in zip(args, self._domain_tests, self.input_domains):
+			if not is_member(arg):
 				raise DomainError(f'Expected element of {domain}, not {arg}')
 		return self._func(*args)
 
+	def map(self, *columns):
+		if not len(columns) == len(self.input_domains):
+			raise TypeError(f'Expected {len(self.input_domains)} operand sequences, not {len(columns)}')
+		columns = self._columns(columns)
+		for column, domain in zip(columns, self.input_domains):
+			violation = domain.first_violation(column)
+			if violation is not None:
+				raise DomainError(f'Expected element of {domain}, not {violation[1]}')
+		# arrays of one shape may go through the function in a single call
+		if self.accepts_arrays is not False and all(map(axioms.is_array, columns)) and len({column.shape for column in columns}) == 1:
+			results = axioms.vectorized_map(self._func, [axioms.exact(column) for column in columns])
+			self.accepts_arrays = results is not None
+			if results is not None:
+				return results
+		return [self._func(*args) for args in zip(*map(axioms.scalars, columns))]
+
+	def _columns(self, columns):
+		columns = [column if axioms.is_array(column) else list(column) for column in columns]
+		if len({len(column) for column in columns}) > 1:
+			raise ValueError('Expected operand sequences of equal length')
+		return columns
+
+
+VALIDATION_POLICIES = ('eager', 'deferred', 'off')
+
 
 class ClosedOperation(Function):
 
@@ -79,63 +135,327 @@ class ClosedOperation(Function):
 			raise TypeError(f'Expected CoralSet, not {typename(domain)}')
 		super().__init__(_func, (domain, domain))
 		self.domain = domain
-		self.cached_samples = set()
 		self.num_samples = 0
 		self.indempotents = set()
+		self._verified = {}
+		self.bound_samples(None)
+		self.table = None
+		self.sampling = None
+		self.parallel = None
+		self.validation = 'eager'
 
 	@property
 	def is_indempotent(self):
+		# with validation off no samples are recorded, so there is nothing to judge by
+		if self.validation == 'off':
+			return None
 		return self.num_samples == len(self.indempotents)
+
+	@property
+	def validation(self):
+		return self._validation
+
+	@validation.setter
+	def validation(self, policy):
+		if policy not in VALIDATION_POLICIES:
+			raise ValueError(f'Expected one of {VALIDATION_POLICIES}, not {policy}')
+		self._validation = policy
+
+	@contextmanager
+	def deferred(self):
+		policy = self.validation
+		self.validation = 'deferred'
+		try:
+			yield self
+		finally:
+			self.validation = policy
+		self.validate()
+
+	def validate(self):
+		self._check_axioms()
+
+	def _check_axioms(self):
+		...
 		
+	def bound_samples(self, maxsize, policy='lru', seed=None):
+		samples = SampleCache(maxsize, policy, seed)
+		samples.on_evict = self._forget_sample
+		for sample in getattr(self, 'cached_samples', ()):
+			samples.add(sample)
+		self.cached_samples = samples
+		self.num_samples = len(samples)
+		return self
+
+	def _forget_sample(self, sample):
+		self.indempotents.discard(sample)
+		for verified in self._verified.values():
+			verified.discard(sample)
+
 	def _cache_sample(self, sample):
 		self.cached_samples.add(sample)
 		self.num_samples = len(self.cached_samples)
 
-	def __call__(self, a, b):
-		self._cache_sample(a)
-		self._cache_sample(b)
-		result = super().__call__(a, b)
-		if result not in self.domain:
+	def tabulate(self):
+		if self.domain.is_infinite:
+			raise ValueError('Cannot tabulate an operation over an infinite domain')
+		index = self.domain._index
+		if index is None:
+			raise TypeError('Cannot tabulate an operation over unhashable elements')
+		elements = tuple(index)
+		# a plain dict answers the n**2 lookups below far faster than a computed index, and a
+		# failed lookup is exactly a product outside the domain
+		if not isinstance(index, dict):
+			index = {element: i for i, element in enumerate(elements)}
+		cells = array(_typecode(len(elements)))
+		for a in elements:
+			row = [self._func(a, b) for b in elements]
+			try:
+				cells.extend([index[result] for result in row])
+			except (KeyError, TypeError):
+				violation = self.domain.first_violation(row)
+				raise ClosureError(f'Operation output {violation[1]} is not in the target {self.domain}') from None
+		table = CayleyTable(elements, cells, index)
+		# quotients come straight from the table; the given inverse is checked against them once,
+		# over every pair or over a random draw of them when the operation samples its checks
+		if self.LEFT_INVERTIBLE:
+			self._tabulate_quotients(table.left_division)
+			counterexample = axioms.left_invertibility_counterexample(table.lookup, self._inverse._func, self._pairs(elements, 'left_invertible'))
+			if counterexample is not None:
+				raise InvertibilityError(f'Operation is not left-invertible over the given domain, e.g. at {counterexample}')
+		if self.RIGHT_INVERTIBLE:
+			self._tabulate_quotients(table.right_division)
+			counterexample = axioms.right_invertibility_counterexample(table.lookup, self._inverse._func, self._pairs(elements, 'right_invertible'))
+			if counterexample is not None:
+				raise InvertibilityError(f'Operation is not right-invertible over the given domain, e.g. at {counterexample}')
+		self.table = table
+		return self
+
+	def _pairs(self, elements, axiom):
+		if self.sampling is not None:
+			return self.sampling.tuples(elements, 2, axiom)
+		return itertools.product(elements, repeat=2)
+
+	def _tabulate_quotients(self, division):
+		try:
+			division()
+		except ValueError as error:
+			raise InvertibilityError(str(error)) from None
+
+	def _index(self, arg):
+		try:
+			return self.table.index[arg]
+		except KeyError:
+			raise DomainError(f'Expected element of {self.domain}, not {arg}') from None
+
+	def _lookup(self, a, b):
+		return self.table.elements[self.table(self._index(a), self._index(b))]
+
+	def _quotient(self, c, a):
+		# divisions are not samples of the inverse, so it is called raw once the domain is checked
+		is_member = self._domain_tests[0]
+		for arg in (c, a):
+			if not is_member(arg):
+				raise DomainError(f'Expected element of {self.domain}, not {arg}')
+		result = self._inverse._func(c, a)
+		if not is_member(result):
 			raise ClosureError(f'Operation output {result} is not in the target {self.domain}')
-		if result == a:
-			self.indempotents.add(a)
-		if result == b:
-			self.indempotents.add(b)
 		return result
 
-	def is_associative(self, samples):
-		if not all(sample in self.domain for sample in samples):
-			raise DomainError(f'Not all sample elements are in the binary operation\'s domain')
-		for a, b, c in itertools.permutations(samples, 3):
-			if not self._func(self._func(a, b), c) == self._func(a, self._func(b, c)):
-				return False
-		return True
+	def left_divide(self, c, a):
+		if not self.LEFT_INVERTIBLE:
+			raise TypeError(f'Cannot left-divide by a {typename(self)}')
+		if self.table is None:
+			return self._quotient(c, a)
+		return self.table.elements[self.table.left_division()(self._index(c), self._index(a))]
+
+	def right_divide(self, c, b):
+		if not self.RIGHT_INVERTIBLE:
+			raise TypeError(f'Cannot right-divide by a {typename(self)}')
+		if self.table is None:
+			return self._quotient(c, b)
+		return self.table.elements[self.table.right_division()(self._index(c), self._index(b))]
+
+	def _operands(self, *sample_groups, shared=False):
+		# tabulated operations are checked over element indices rather than the elements themselves
+		if self.table is None:
+			# a pool keeps its workers only while it is handed the same operation every time
+			return (self._func if shared else axioms.memoized(self._func), *sample_groups)
+		return (self.table, *(self.table.indices_of(samples) for samples in sample_groups))
 
-	def is_commutative(self, samples):
-		if not all(sample in self.domain for sample in samples):
-			raise DomainError(f'Not all sample elements are in the binary operation\'s domain')
-		for a, b in itertools.permutations(samples, 2):
-			if not self._func(a, b) == self._func(b, a):
-				return False
-		return True
+	def __call__(self, a, b):
+		# with validation off nothing will ever be checked, so no samples are kept either
+		recording = not self.validation == 'off'
+		if recording:
+			self._cache_sample(a)
+			self._cache_sample(b)
+		if self.table is not None:
+			result = self._lookup(a, b)
+		else:
+			result = super().__call__(a, b)
+			if not self._domain_tests[0](result):
+				raise ClosureError(f'Operation output {result} is not in the target {self.domain}')
+		if recording:
+			if result == a and a in self.cached_samples:
+				self.indempotents.add(a)
+			if result == b and b in self.cached_samples:
+				self.indempotents.add(b)
+		if self.validation == 'eager':
+			self._check_axioms()
+		return result
 
-	def is_left_invertible(self, samples):
-		if not all(sample in self.domain for sample in samples):
-			raise DomainError(f'Not all sample elements are in the binary operation\'s domain')
-		for a, b in itertools.permutations(samples, 2):
-			c = self._func(a, b)
-			if not b == self._inverse(c, a):
-				return False
-		return True
-
-	def is_right_invertible(self, samples):
-		if not all(sample in self.domain for sample in samples):
+	def apply_many(self, left, right):
+		left, right = self._columns((left, right))
+		if self.table is not None:
+			results = [self._lookup(a, b) for a, b in zip(axioms.scalars(left), axioms.scalars(right))]
+		else:
+			results = self.map(left, right)
+			violation = self.domain.first_violation(results)
+			if violation is not None:
+				raise ClosureError(f'Operation output {violation[1]} is not in the target {self.domain}')
+		if not self.validation == 'off':
+			for a, b, result in zip(axioms.scalars(left), axioms.scalars(right), axioms.scalars(results)):
+				self._cache_sample(a)
+				self._cache_sample(b)
+				if result == a and a in self.cached_samples:
+					self.indempotents.add(a)
+				if result == b and b in self.cached_samples:
+					self.indempotents.add(b)
+		# a batch is validated once, as though it were a single call
+		if self.validation == 'eager':
+			self._check_axioms()
+		return results
+
+	def _partition(self, samples, verified):
+		if isinstance(samples, (set, frozenset, SampleCache)) and isinstance(verified, (set, frozenset)):
+			old, new = list(samples & verified), list(samples - verified)
+		else:
+			old, new = [], []
+			for sample in samples:
+				(old if sample in verified else new).append(sample)
+		if not self.domain.all_in(new):
 			raise DomainError(f'Not all sample elements are in the binary operation\'s domain')
-		for a, b in itertools.permutations(samples, 2):
-			c = self._func(a, b)
-			if not a == self._inverse(c, b):
-				return False
-		return True
+		return old, new
+
+	def sample_randomly(self, checks=1000, seed=None, time_budget=None):
+		self.sampling = axioms.RandomSampling(checks, seed, time_budget)
+		return self
+
+	def parallelize(self, workers=None, threshold=4096):
+		self.parallel = ProcessPoolVerification(workers, threshold)
+		return self
+
+	def _in_parallel(self, old, new, length):
+		if self.parallel is None or self.sampling is not None or not new:
+			return False
+		# only the tuples involving a new sample are checked
+		return self.parallel.applies_to((len(old) + len(new))**length - len(old)**length)
+
+	def _verify(self, prop, find_counterexample):
+		# samples that have already passed a check are only revisited alongside new ones; a
+		# passing random round proves nothing beyond domain membership, so it is kept apart
+		key = prop if self.sampling is None else (prop, 'sampled')
+		verified = self._verified.setdefault(key, set())
+		counterexample = find_counterexample(self.cached_samples, verified)
+		if counterexample is None:
+			verified.update(self.cached_samples)
+		return counterexample
+
+	def _tuples(self, old, new, length, axiom, symmetric=False):
+		if self.sampling is not None:
+			return self.sampling.tuples((*old, *new), length, axiom)
+		if symmetric:
+			return axioms.pairs_involving(old, new)
+		return axioms.tuples_involving(old, new, length)
+
+	def _elements_of(self, counterexample):
+		if counterexample is None or self.table is None:
+			return counterexample
+		return tuple(self.table.elements[i] for i in counterexample)
+
+	def _arrays(self, old, new):
+		if self.table is not None or self.sampling is not None or not new:
+			return None
+		if len(old) + len(new) < axioms.VECTORIZATION_THRESHOLD:
+			return None
+		if self.accepts_arrays is None:
+			self.accepts_arrays = axioms.accepts_arrays(self._func, (*new, *old))
+		if not self.accepts_arrays:
+			return None
+		arrays = axioms.as_array(old), axioms.as_array(new), axioms.as_array((*old, *new))
+		return None if any(array is None for array in arrays) else arrays
+
+	def associativity_counterexample(self, samples, verified=()):
+		old, new = self._partition(samples, verified)
+		# a vectorized check outruns a pool of workers, so the pool only takes what numpy cannot
+		arrays = self._arrays(old, new)
+		if arrays is not None:
+			old_array, new_array, everything = arrays
+			blocks = axioms.blocks_involving(old_array, new_array, 3, everything)
+			try:
+				return axioms.vectorized_associativity_counterexample(self._func, blocks)
+			except Exception:
+				# whatever went wrong is reproduced, or ruled out, by the scalar check below
+				self.accepts_arrays = False
+		if self._in_parallel(old, new, 3):
+			op, old, new = self._operands(old, new, shared=True)
+			return self._elements_of(self.parallel.counterexample(axioms.associativity_counterexample, (op,), old, new, 3))
+		op, old, new = self._operands(old, new)
+		triples = self._tuples(old, new, 3, 'associative')
+		return self._elements_of(axioms.associativity_counterexample(op, triples))
+
+	def commutativity_counterexample(self, samples, verified=()):
+		old, new = self._partition(samples, verified)
+		arrays = self._arrays(old, new)
+		if arrays is not None:
+			old_array, new_array, everything = arrays
+			blocks = axioms.blocks_involving(old_array, new_array, 2, everything)
+			try:
+				return axioms.vectorized_commutativity_counterexample(self._func, blocks)
+			except Exception:
+				self.accepts_arrays = False
+		op, old, new = self._operands(old, new)
+		pairs = self._tuples(old, new, 2, 'commutative', symmetric=True)
+		return self._elements_of(axioms.commutativity_counterexample(op, pairs))
+
+	def _quotients(self, side, shared=False):
+		# the checks have already placed every sample in the domain, so the raw inverse is enough
+		if self.table is None:
+			return self._inverse._func if shared else axioms.memoized(self._inverse._func)
+		return self.table.left_division() if side == 'left' else self.table.right_division()
+
+	def left_invertibility_counterexample(self, samples, verified=()):
+		old, new = self._partition(samples, verified)
+		parallel = self._in_parallel(old, new, 2)
+		op, old, new = self._operands(old, new, shared=parallel)
+		inverse = self._quotients('left', shared=parallel)
+		if parallel:
+			find = axioms.left_invertibility_counterexample
+			return self._elements_of(self.parallel.counterexample(find, (op, inverse), old, new, 2))
+		pairs = self._tuples(old, new, 2, 'left_invertible')
+		return self._elements_of(axioms.left_invertibility_counterexample(op, inverse, pairs))
+
+	def right_invertibility_counterexample(self, samples, verified=()):
+		old, new = self._partition(samples, verified)
+		parallel = self._in_parallel(old, new, 2)
+		op, old, new = self._operands(old, new, shared=parallel)
+		inverse = self._quotients('right', shared=parallel)
+		if parallel:
+			find = axioms.right_invertibility_counterexample
+			return self._elements_of(self.parallel.counterexample(find, (op, inverse), old, new, 2))
+		pairs = self._tuples(old, new, 2, 'right_invertible')
+		return self._elements_of(axioms.right_invertibility_counterexample(op, inverse, pairs))
+
+	def is_associative(self, samples, verified=()):
+		return self.associativity_counterexample(samples, verified) is None
+
+	def is_commutative(self, samples, verified=()):
+		return self.commutativity_counterexample(samples, verified) is None
+
+	def is_left_invertible(self, samples, verified=()):
+		return self.left_invertibility_counterexample(samples, verified) is None
+
+	def is_right_invertible(self, samples, verified=()):
+		return self.right_invertibility_counterexample(samples, verified) is None
 
 
 class AssociativeMeta(type):
@@ -148,12 +468,12 @@ class AssociativeOperation(ClosedOperation, metaclass=AssociativeMeta):
 
 	ASSOCIATIVE = True
 
-	def __call__(self, a, b):
-		result = super().__call__(a, b)
+	def _check_axioms(self):
+		super()._check_axioms()
 		if self.num_samples >= 3:
-			if not self.is_associative(self.cached_samples):
-				raise AssociativityError('Operation is not associative over the given domain')
-		return result
+			counterexample = self._verify('associative', self.associativity_counterexample)
+			if counterexample is not None:
+				raise AssociativityError(f'Operation is not associative over the given domain, e.g. at {counterexample}')
 
 
 class CommutativeMeta(type):
@@ -166,12 +486,12 @@ class CommutativeOperation(ClosedOperation, metaclass=CommutativeMeta):
 
 	COMMUTATIVE = True
 
-	def __call__(self, a, b):
-		result = super().__call__(a, b)
+	def _check_axioms(self):
+		super()._check_axioms()
 		if self.num_samples >= 2:
-			if not self.is_commutative(self.cached_samples):
-				raise CommutativityError('Operation is not commutative over the given domain')
-		return result
+			counterexample = self._verify('commutative', self.commutativity_counterexample)
+			if counterexample is not None:
+				raise CommutativityError(f'Operation is not commutative over the given domain, e.g. at {counterexample}')
 
 
 # alias for CommutativeOperation
@@ -184,12 +504,12 @@ class AssociativeAbelianOperation(AbelianOperation):
 	ASSOCIATIVE = True
 	LATIN_SQUARE = True
 
-	def __call__(self, a, b):
-		result = super().__call__(a, b)
+	def _check_axioms(self):
+		super()._check_axioms()
 		if self.num_samples >= 3:
-			if not self.is_associative(self.cached_samples):
-				raise AssociativityError('Operation is not associative over the given domain')
-		return result
+			counterexample = self._verify('associative', self.associativity_counterexample)
+			if counterexample is not None:
+				raise AssociativityError(f'Operation is not associative over the given domain, e.g. at {counterexample}')
 
 
 class LeftInvertibleMeta(type):
@@ -206,12 +526,12 @@ class LeftInvertibleOperation(ClosedOperation, metaclass=LeftInvertibleMeta):
 		super().__init__(_func, domain)
 		self._inverse = ClosedOperation(_func_inverse, domain)
 
-	def __call__(self, a, b):
-		result = super().__call__(a, b)
+	def _check_axioms(self):
+		super()._check_axioms()
 		if self.num_samples >= 2:
-			if not self.is_left_invertible(self.cached_samples):
-				raise InvertibilityError('Operation is not left-invertible over the given domain')
-		return result
+			counterexample = self._verify('left_invertible', self.left_invertibility_counterexample)
+			if counterexample is not None:
+				raise InvertibilityError(f'Operation is not left-invertible over the given domain, e.g. at {counterexample}')
 
 
 class RightInvertibleMeta(type):
@@ -228,12 +548,12 @@ class RightInvertibleOperation(ClosedOperation, metaclass=RightInvertibleMeta):
 		super().__init__(_func, domain)
 		self._inverse = ClosedOperation(_func_inverse, domain)
 
-	def __call__(self, a, b):
-		result = super().__call__(a, b)
+	def _check_axioms(self):
+		super()._check_axioms()
 		if self.num_samples >= 2:
-			if not self.is_right_invertible(self.cached_samples):
-				raise InvertibilityError('Operation is not right-invertible over the given domain')
-		return result
+			counterexample = self._verify('right_invertible', self.right_invertibility_counterexample)
+			if counterexample is not None:
+				raise InvertibilityError(f'Operation is not right-invertible over the given domain, e.g. at {counterexample}')
 
 
 class InvertibleMeta(type):
@@ -253,14 +573,15 @@ class InvertibleOperation(ClosedOperation, metaclass=InvertibleMeta):
 		super().__init__(_func, domain)
 		self._inverse = ClosedOperation(_func_inverse, domain)
 
-	def __call__(self, a, b):
-		result = super().__call__(a, b)
+	def _check_axioms(self):
+		super()._check_axioms()
 		if self.num_samples >= 2:
-			if not self.is_left_invertible(self.cached_samples):
-				raise InvertibilityError('Operation is not left-invertible over the given domain')
-			if not self.is_right_invertible(self.cached_samples):
-				raise InvertibilityError('Operation is not right-invertible over the given domain')
-		return result
+			counterexample = self._verify('left_invertible', self.left_invertibility_counterexample)
+			if counterexample is not None:
+				raise InvertibilityError(f'Operation is not left-invertible over the given domain, e.g. at {counterexample}')
+			counterexample = self._verify('right_invertible', self.right_invertibility_counterexample)
+			if counterexample is not None:
+				raise InvertibilityError(f'Operation is not right-invertible over the given domain, e.g. at {counterexample}')
 
 
 class ModularOperation(InvertibleOperation):
@@ -273,10 +594,20 @@ def addition_mod(n):
 	return ModularOperation(
 		lambda a, b: (a + b) % n,
 		lambda a, b: (a - b) if a >= b else (a - b) + n,
-		CoralSet([*range(n)])
+		CoralRange(n)
 	)
 
 
+class ModularMultiplication(CommutativeOperation):
+	ASSOCIATIVE = True
+
+
+def multiplication_mod(n):
+	if not (isinstance(n, int) and n > 0):
+		raise TypeError('Can only take a modulo by a positive integer')
+	return ModularMultiplication(lambda a, b: (a*b) % n, CoralRange(n))
+
+
 class LatinSquareMeta(type):
 
 	def __instancecheck__(cls, instance):
@@ -287,49 +618,66 @@ class LatinSquareOperation(ClosedOperation, metaclass=LatinSquareMeta):
 
 	LATIN_SQUARE = True
 
+	def latin_square_counterexample(self, samples, verified=()):
+		old, new = self._partition(samples, verified)
+		if not new:
+			return None
+		parallel = self._in_parallel((), (*old, *new), 1)
+		op, everything = self._operands((*old, *new), shared=parallel)
+		if self.table is None:
+			find, operands = axioms.latin_square_counterexample, (op,)
+		else:
+			find, operands = self.table.latin_square_counterexample, ()
+		if parallel:
+			return self._elements_of(self.parallel.counterexample(find, operands, (), everything, 1, (everything,)))
+		if self.sampling is not None:
+			singletons = self.sampling.tuples(everything, 1, 'latin_square')
+		else:
+			singletons = ((sample,) for sample in everything)
+		return self._elements_of(find(*operands, everything, singletons))
+
 	def satisfies_latin_square_property(self, samples):
-		for a, b in itertools.permutations(samples, 2):
-			left_exists = any(self._func(s, a) == b for s in samples)
-			right_exists = any(self._func(a, s) == b for s in samples)
-			if left_exists and right_exists:
-				return True
-		return False
-	
-	def __call__(self, a, b):
-		result = super().__call__(a, b)
+		return self.latin_square_counterexample(samples) is None
+
+	def _check_axioms(self):
+		super()._check_axioms()
 		if self.num_samples >= 2:
-			if not self.satisfies_latin_square_property(self.cached_samples):
-				raise PropertyError('Operation fails to satisfy the Latin Square Property')
-		return result
+			counterexample = self._verify('latin_square', self.latin_square_counterexample)
+			if counterexample is not None:
+				raise PropertyError(f'Operation fails to satisfy the Latin Square Property, e.g. at {counterexample}')
 
 
 class GroupOperation(InvertibleOperation):
 
 	ASSOCIATIVE = True
 
-	def __call__(self, a, b):
-		result = super().__call__(a, b)
+	def _check_axioms(self):
+		super()._check_axioms()
 		if self.num_samples >= 3:
-			if not self.is_associative(self.cached_samples):
-				raise AssociativityError('Operation is not associative over the given domain')
-		return result
+			counterexample = self._verify('associative', self.associativity_counterexample)
+			if counterexample is not None:
+				raise AssociativityError(f'Operation is not associative over the given domain, e.g. at {counterexample}')
+
+	def inverse(self, x):
+		# x*e == x picks out the identity, and x*y == e picks out the inverse
+		return self.left_divide(self.left_divide(x, x), x)
 
 	@classmethod
 	def from_invertible(cls, invertible_operation):
 		if not isinstance(invertible_operation, InvertibleOperation):
 			raise TypeError('Must provide an invertible operation to define a group operation in this way')
-		return GroupOperation(invertible_operation._func, invertible_operation._inverse, invertible_operation.domain)
+		return GroupOperation(invertible_operation._func, invertible_operation._inverse._func, invertible_operation.domain)
 
 
 class AbelianGroupOperation(GroupOperation):
 
 	COMMUTATIVE = True
 
-	def __call__(self, a, b):
-		result = super().__call__(a, b)
+	def _check_axioms(self):
+		super()._check_axioms()
 		if self.num_samples >= 2:
-			if not self.is_commutative(self.cached_samples):
-				raise CommutativityError('Operation is not commutative over the given domain')
-		return result
+			counterexample = self._verify('commutative', self.commutativity_counterexample)
+			if counterexample is not None:
+				raise CommutativityError(f'Operation is not commutative over the given domain, e.g. at {counterexample}')
 
 
@@ -0,0 +1,124 @@
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import multiprocessing
+import itertools
+import operator
+import os
+
+from .utils import typename
+from . import axioms
+
+
+# forked workers inherit everything registered here before the pool was forked, so operations
+# built from lambdas never have to be pickled; only tokens, shard bounds and samples cross over
+_shared = {}
+_tokens = itertools.count()
+
+
+def _fork_context():
+	if 'fork' not in multiprocessing.get_all_start_methods():
+		return None
+	return multiprocessing.get_context('fork')
+
+
+def _shard_tuples(old, new, start, stop, length, cancelled):
+	everything = (*old, *new)
+	for position in range(start, stop):
+		if cancelled.is_set():
+			return
+		head = everything[position]
+		# a tuple led by an old sample still needs a new sample somewhere after it
+		if position >= len(old):
+			rest = itertools.product(everything, repeat=length - 1)
+		else:
+			rest = axioms.tuples_involving(old, new, length - 1)
+		for tail in rest:
+			yield (head, *tail)
+
+
+def _search_shard(token, check, start, stop, old, new, length, arguments):
+	checks, cancelled = _shared[token]
+	find, operands = checks[check]
+	counterexample = find(*operands, *arguments, _shard_tuples(old, new, start, stop, length, cancelled))
+	if counterexample is not None:
+		cancelled.set()
+	return counterexample
+
+
+class ProcessPoolVerification:
+
+	def __init__(self, workers=None, threshold=4096):
+		if workers is None:
+			workers = os.cpu_count() or 1
+		if not (isinstance(workers, int) and workers > 0):
+			raise ValueError(f'Expected a positive number of workers, not {workers}')
+		if not (isinstance(threshold, int) and threshold >= 0):
+			raise ValueError(f'Expected a non-negative tuple threshold, not {threshold}')
+		self.workers = workers
+		self.threshold = threshold
+		self._token = next(_tokens)
+		self._checks = []
+		self._executor = None
+		self._cancelled = None
+
+	def __repr__(self):
+		return f'{typename(self)}(workers={self.workers}, threshold={self.threshold})'
+
+	def applies_to(self, num_tuples):
+		return self.workers > 1 and num_tuples >= self.threshold and _fork_context() is not None
+
+	def _registered(self, find, operands):
+		for check, (known_find, known_operands) in enumerate(self._checks):
+			if find == known_find and len(operands) == len(known_operands) and all(map(operator.is_, operands, known_operands)):
+				return check
+		return None
+
+	def _pool(self, find, operands):
+		check = self._registered(find, operands)
+		if check is not None and self._executor is not None:
+			return check
+		# workers only see what was registered before they were forked, so a new check means a new pool
+		self.close()
+		if check is None:
+			self._checks.append((find, operands))
+			check = len(self._checks) - 1
+		context = _fork_context()
+		self._cancelled = context.Event()
+		_shared[self._token] = (tuple(self._checks), self._cancelled)
+		self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+		return check
+
+	def close(self):
+		if self._executor is not None:
+			self._executor.shutdown()
+			self._executor = None
+		_shared.pop(self._token, None)
+
+	def counterexample(self, find, operands, old, new, length, arguments=()):
+		# operands are inherited by the workers and must stay the same objects between checks,
+		# while samples and arguments are sent along with every shard
+		old, new = tuple(old), tuple(new)
+		total = len(old) + len(new)
+		check = self._pool(find, operands)
+		self._cancelled.clear()
+		# several shards per worker even out the uneven cost of old and new heads,
+		# but none is given fewer tuples than the threshold that made the pool worth using
+		shards = min(4*self.workers, max(1, (total**length - len(old)**length) // max(1, self.threshold)))
+		size = max(1, -(-total // shards))
+		pending = {
+			self._executor.submit(_search_shard, self._token, check, start, min(start + size, total), old, new, length, arguments)
+			for start in range(0, total, size)
+		}
+		try:
+			while pending:
+				done, pending = wait(pending, return_when=FIRST_COMPLETED)
+				for future in done:
+					counterexample = future.result()
+					if counterexample is not None:
+						return counterexample
+			return None
+		finally:
+			# shards still running wind down before the pool is handed to the next check
+			self._cancelled.set()
+			for remaining in pending:
+				remaining.cancel()
+			wait(pending)
@@ -0,0 +1,618 @@
+from fractions import Fraction
+from math import gcd, inf, floor, ceil
+
+from .utils import typename
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# arrays are judged by the Python scalars their elements convert to
+_DTYPE_KINDS = {'b': bool, 'i': int, 'u': int, 'f': float, 'c': complex}
+
+
+def _lcm(a, b):
+    return a * b // gcd(a, b)
+
+
+class _Interval:
+
+    def __init__(self, low, high, low_closed, high_closed):
+        self.low, self.high = low, high
+        # an infinite endpoint is never attained
+        self.low_closed = low_closed and not low == -inf
+        self.high_closed = high_closed and not high == inf
+        self.key = (self.low, self.high, self.low_closed, self.high_closed)
+
+    def __repr__(self):
+        return f'{"[" if self.low_closed else "("}{self.low}, {self.high}{"]" if self.high_closed else ")"}'
+
+    @property
+    def is_empty(self):
+        return self.low > self.high or (self.low == self.high and not (self.low_closed and self.high_closed))
+
+    def contains(self, x):
+        low, high = self.low, self.high
+        return (low < x or (self.low_closed and x == low)) and (x < high or (self.high_closed and x == high))
+
+    def mask(self, values):
+        low, high = self.low, self.high
+        return ((low < values) | (self.low_closed & (values == low))) & ((values < high) | (self.high_closed & (values == high)))
+
+    def within(self, other):
+        above = other.low < self.low or (other.low == self.low and (other.low_closed or not self.low_closed))
+        below = self.high < other.high or (self.high == other.high and (other.high_closed or not self.high_closed))
+        return above and below
+
+    def integral(self):
+        # the same integers, between the closed integer bounds nearest inside this interval
+        low, high = self.low, self.high
+        if abs(low) < inf:
+            low = floor(low) + 1 if not self.low_closed and low == floor(low) else ceil(low)
+        if abs(high) < inf:
+            high = ceil(high) - 1 if not self.high_closed and high == ceil(high) else floor(high)
+        return _Interval(low, high, True, True)
+
+    def joins(self, other, integral):
+        # whether the union of two intervals, self starting no later, is one interval
+        if integral:
+            return other.low <= self.high + 1
+        return other.low < self.high or (other.low == self.high and (self.high_closed or other.low_closed))
+
+    def hull(self, other):
+        low, low_closed = min((self.low, not self.low_closed), (other.low, not other.low_closed))
+        high, high_closed = max((self.high, self.high_closed), (other.high, other.high_closed))
+        return _Interval(low, high, not low_closed, high_closed)
+
+    def intersect(self, other):
+        if self.low == other.low:
+            low, low_closed = self.low, self.low_closed and other.low_closed
+        else:
+            low, low_closed = max((self.low, self.low_closed), (other.low, other.low_closed), key=lambda end: end[0])
+        if self.high == other.high:
+            high, high_closed = self.high, self.high_closed and other.high_closed
+        else:
+            high, high_closed = min((self.high, self.high_closed), (other.high, other.high_closed), key=lambda end: end[0])
+        return _Interval(low, high, low_closed, high_closed)
+
+
+_REAL_LINE = _Interval(-inf, inf, False, False)
+
+
+def _prime_factors(n):
+    factors, f = [], 2
+    while f * f <= n:
+        if n % f == 0:
+            factors.append(f)
+            while n % f == 0:
+                n //= f
+        f += 1 if f == 2 else 2
+    return factors + [n] if n > 1 else factors
+
+
+def _class_within(a, b):
+    # r mod m lies within s mod k exactly when k divides m and r is s modulo k
+    (r, m), (s, k) = a, b
+    return m % k == 0 and r % k == s
+
+
+def _meet(a, b):
+    # the congruence class shared by two others, by the Chinese remainder theorem
+    (r, m), (s, k) = a, b
+    g = gcd(m, k)
+    if (s - r) % g:
+        return None
+    modulus = m // g * k
+    step = (s - r) // g * pow(m // g, -1, k // g) % (k // g)
+    return ((r + m*step) % modulus, modulus)
+
+
+def _count(a, low, high):
+    # how many members of a class lie between two integers
+    r, m = a
+    return (high - r) // m - (low - 1 - r) // m
+
+
+def _union_size(classes, size):
+    # inclusion-exclusion over the classes, skipping every intersection that is already empty
+    total = 0
+    def visit(start, current, sign):
+        nonlocal total
+        for i in range(start, len(classes)):
+            meet = classes[i] if current is None else _meet(current, classes[i])
+            if meet is not None:
+                total += sign * size(meet)
+                visit(i + 1, meet, -sign)
+    visit(0, None, 1)
+    return total
+
+
+_INCLUSION_EXCLUSION = 12
+_ENUMERABLE = 1 << 12
+
+
+def _split_covered(a, classes):
+    # splits a class along a prime at a time until each piece lies within a class or is shown
+    # too sparse to be covered; None if that takes more than a few thousand pieces
+    pieces, budget = [a], _ENUMERABLE
+    while pieces:
+        piece = pieces.pop()
+        meets = [meet for meet in (_meet(piece, c) for c in classes) if meet is not None]
+        if any(meet == piece for meet in meets):
+            continue
+        r, m = piece
+        if sum(Fraction(m, k) for _, k in meets) < 1:
+            return False
+        modulus = 1
+        for _, k in meets:
+            modulus = _lcm(modulus, k)
+        p = _prime_factors(modulus // m)[0]
+        budget -= p
+        if budget < 0:
+            return None
+        pieces.extend((r + i*m, p*m) for i in range(p))
+    return True
+
+
+def _class_covered(a, classes, low=-inf, high=inf):
+    # True or False when it can be decided whether the members of a class between two
+    # integers all lie in some of the other classes, None when it cannot
+    meets = [meet for meet in (_meet(a, c) for c in classes) if meet is not None]
+    if any(meet == a for meet in meets):
+        return True
+    bounded = abs(low) < inf and abs(high) < inf
+    total = _count(a, low, high) if bounded else None
+    if total == 0:
+        return True
+    if not meets:
+        return False
+    if len(meets) <= _INCLUSION_EXCLUSION:
+        if bounded:
+            return _union_size(meets, lambda c: _count(c, low, high)) == total
+        # classes recur forever in either direction, so densities settle it
+        return _union_size(meets, lambda c: Fraction(1, c[1])) == Fraction(1, a[1])
+    if bounded and total <= _ENUMERABLE:
+        r, m = a
+        first = low + (r - low) % m
+        return all(any(n % k == s for s, k in meets) for n in range(first, high + 1, m))
+    period = a[1]
+    for _, k in meets:
+        period = _lcm(period, k)
+    if bounded and high - low + 1 < period:
+        return None
+    return _split_covered(a, meets)
+
+
+class _Residues:
+
+    # a union of congruence classes, each a (residue, modulus) pair
+    def __init__(self, classes):
+        self.classes = _coarsened(classes)
+        self.key = self.classes
+
+    def __repr__(self):
+        return ' | '.join(f'{r} mod {m}' for r, m in sorted(self.classes, key=lambda c: (c[1], c[0])))
+
+    @property
+    def is_full(self):
+        return (0, 1) in self.classes
+
+    def within(self, other):
+        return all(_class_covered(a, other.classes) is True for a in self.classes)
+
+    def intersect(self, other):
+        meets = (_meet(a, b) for a in self.classes for b in other.classes)
+        return _Residues(meet for meet in meets if meet is not None)
+
+    def union(self, other):
+        return _Residues(self.classes | other.classes)
+
+
+def _coarsened(classes):
+    # sibling classes that together make up a coarser one are replaced by it, and any class
+    # lying within another is dropped
+    classes = {(r % m, m) for r, m in classes}
+    merging = True
+    while merging:
+        merging = False
+        by_modulus = {}
+        for r, m in classes:
+            by_modulus.setdefault(m, set()).add(r)
+        for m, residues in by_modulus.items():
+            for p in _prime_factors(m):
+                if len(residues) < p:
+                    continue
+                coarse = m // p
+                for r in residues:
+                    siblings = {(r % coarse + i*coarse, m) for i in range(p)}
+                    if siblings <= classes:
+                        classes = (classes - siblings) | {(r % coarse, coarse)}
+                        merging = True
+                        break
+                if merging:
+                    break
+            if merging:
+                break
+    return frozenset(a for a in classes if not any(not a == b and _class_within(a, b) for b in classes))
+
+
+class _Clause:
+
+    # a type, optionally restricted to the real values in an interval and to integers in
+    # a union of congruence classes; a predicate is a union of these
+    def __init__(self, kind, interval=None, residues=None):
+        self.kind = kind
+        if interval is not None and issubclass(kind, int) and not interval.is_empty:
+            interval = interval.integral()
+        self.interval = interval
+        self.residues = None if residues is not None and residues.is_full else residues
+        self.key = (
+            kind,
+            None if interval is None else interval.key,
+            None if self.residues is None else self.residues.key
+        )
+        self.test = self._compile()
+
+    def __repr__(self):
+        constraints = [c for c in (self.interval, self.residues) if c is not None]
+        return ' & '.join([self.kind.__name__, *map(repr, constraints)])
+
+    @property
+    def is_empty(self):
+        if self.interval is not None and (self.interval.is_empty or not issubclass(self.kind, (int, float, complex))):
+            return True
+        if self.residues is not None and (not self.residues.classes or not issubclass(self.kind, int)):
+            return True
+        return False
+
+    def _compile(self):
+        kind, interval, residues = self.kind, self.interval, self.residues
+        if interval is None and residues is None:
+            return lambda candidate: isinstance(candidate, kind)
+        moduli = {}
+        for r, m in () if residues is None else residues.classes:
+            moduli.setdefault(m, set()).add(r)
+        moduli = tuple((m, frozenset(rs)) for m, rs in moduli.items())
+        def test(candidate):
+            if not isinstance(candidate, kind):
+                return False
+            if interval is not None:
+                if isinstance(candidate, complex):
+                    if candidate.imag:
+                        return False
+                    candidate = candidate.real
+                if not interval.contains(candidate):
+                    return False
+            return not moduli or any(candidate % m in rs for m, rs in moduli)
+        return test
+
+    def mask(self, array, kind):
+        if not issubclass(kind, self.kind):
+            return numpy.zeros(array.shape, dtype=bool)
+        mask = numpy.ones(array.shape, dtype=bool)
+        if self.interval is not None:
+            if issubclass(kind, complex):
+                mask &= array.imag == 0
+                array = array.real
+            mask &= self.interval.mask(array)
+        if self.residues is not None:
+            moduli = sorted({m for _, m in self.residues.classes})
+            mask &= numpy.logical_or.reduce([
+                numpy.isin(array % m, sorted(r for r, k in self.residues.classes if k == m)) for m in moduli
+            ])
+        return mask
+
+    def _effective_interval(self):
+        # every integer is real, whereas an unrestricted float may be nan
+        if self.interval is None and issubclass(self.kind, int):
+            return _REAL_LINE
+        return self.interval
+
+    def within(self, other):
+        if not isinstance(other, _Clause) or not issubclass(self.kind, other.kind):
+            return False
+        if other.interval is not None:
+            interval = self._effective_interval()
+            if interval is None or not interval.within(other.interval):
+                return False
+        if other.residues is not None:
+            if self.residues is None or not self.residues.within(other.residues):
+                return False
+        return True
+
+    def intersect(self, other):
+        if issubclass(self.kind, other.kind):
+            kind = self.kind
+        elif issubclass(other.kind, self.kind):
+            kind = other.kind
+        else:
+            return None
+        interval, residues = self.interval, self.residues
+        if other.interval is not None:
+            interval = other.interval if interval is None else interval.intersect(other.interval)
+        if other.residues is not None:
+            residues = other.residues if residues is None else residues.intersect(other.residues)
+        clause = _Clause(kind, interval, residues)
+        return None if clause.is_empty else clause
+
+
+class _Members:
+
+    def __init__(self, elements):
+        self.elements = frozenset(elements)
+        self.key = self.elements
+        elements = self.elements
+        def test(candidate):
+            try:
+                return candidate in elements
+            except TypeError:
+                return False
+        self.test = test
+
+    def __repr__(self):
+        return f'{{{", ".join(map(repr, self.elements))}}}'
+
+    @property
+    def is_empty(self):
+        return not self.elements
+
+    def mask(self, array, kind):
+        numbers = [element for element in self.elements if isinstance(element, (int, float, complex))]
+        if not numbers:
+            return numpy.zeros(array.shape, dtype=bool)
+        return numpy.isin(array, numbers)
+
+    def within(self, other):
+        return all(map(other.test, self.elements))
+
+    def intersect(self, other):
+        members = _Members(filter(other.test, self.elements))
+        return None if members.is_empty else members
+
+
+class Predicate:
+
+    def __init__(self, clauses=()):
+        self.clauses = self._normalized(clauses)
+        tests = tuple(clause.test for clause in self.clauses)
+        if not tests:
+            self.test = lambda candidate: False
+        elif len(tests) == 1:
+            self.test = tests[0]
+        else:
+            self.test = lambda candidate: any(test(candidate) for test in tests)
+
+    @staticmethod
+    def _normalized(clauses):
+        clauses = [clause for clause in clauses if not clause.is_empty]
+        # merging one way can open up merges the other way, so both run until neither applies
+        while True:
+            count = len(clauses)
+            clauses = Predicate._joined(Predicate._merged(clauses))
+            if len(clauses) == count:
+                break
+        # and anything already covered by another clause is dropped
+        kept = []
+        for i, clause in enumerate(clauses):
+            if isinstance(clause, _Members):
+                rest = [other for other in clauses if isinstance(other, _Clause)]
+                clause = _Members(element for element in clause.elements if not any(other.test(element) for other in rest))
+                if not clause.is_empty:
+                    kept.append(clause)
+                continue
+            if any(clause.within(other) and (not other.within(clause) or j < i) for j, other in enumerate(clauses) if not i == j):
+                continue
+            kept.append(clause)
+        return tuple(kept)
+
+    @staticmethod
+    def _merged(clauses):
+        # clauses differing only in their congruence classes collapse into one
+        merged = {}
+        for clause in clauses:
+            if isinstance(clause, _Clause):
+                shape = clause.key[:2]
+                if shape in merged and isinstance(merged[shape], _Clause):
+                    existing = merged[shape]
+                    if existing.residues is None or clause.residues is None:
+                        residues = None
+                    else:
+                        residues = existing.residues.union(clause.residues)
+                    clause = _Clause(clause.kind, clause.interval, residues)
+                merged[shape] = clause
+            else:
+                merged.setdefault('members', _Members(()))
+                merged['members'] = _Members(merged['members'].elements | clause.elements)
+        return list(merged.values())
+
+    @staticmethod
+    def _joined(clauses):
+        # and clauses differing only in intervals that overlap or touch collapse into one
+        groups, rest = {}, []
+        for clause in clauses:
+            if isinstance(clause, _Clause) and clause.interval is not None:
+                groups.setdefault((clause.kind, clause.key[2]), []).append(clause)
+            else:
+                rest.append(clause)
+        for group in groups.values():
+            group.sort(key=lambda clause: (clause.interval.low, not clause.interval.low_closed))
+            integral = issubclass(group[0].kind, int)
+            current = group[0]
+            for clause in group[1:]:
+                if current.interval.joins(clause.interval, integral):
+                    current = _Clause(current.kind, current.interval.hull(clause.interval), current.residues)
+                else:
+                    rest.append(current)
+                    current = clause
+            rest.append(current)
+        return rest
+
+    def __repr__(self):
+        return ' | '.join(f'({clause})' for clause in self.clauses) or 'nothing'
+
+    def __call__(self, candidate):
+        return self.test(candidate)
+
+    def mask(self, array):
+        kind = _DTYPE_KINDS.get(array.dtype.kind)
+        if kind is None:
+            return None
+        mask = numpy.zeros(array.shape, dtype=bool)
+        for clause in self.clauses:
+            mask |= clause.mask(array, kind)
+        return mask
+
+    def __or__(self, other):
+        if not isinstance(other, Predicate):
+            raise TypeError(f'Expected Predicate, not {typename(other)}')
+        return Predicate((*self.clauses, *other.clauses))
+
+    def __and__(self, other):
+        if not isinstance(other, Predicate):
+            raise TypeError(f'Expected Predicate, not {typename(other)}')
+        intersections = (
+            a.intersect(b) if isinstance(a, _Members) or not isinstance(b, _Members) else b.intersect(a)
+            for a in self.clauses for b in other.clauses
+        )
+        return Predicate(clause for clause in intersections if clause is not None)
+
+    def subset_of(self, other):
+        # True or False when it can be decided, None when it cannot
+        if not isinstance(other, Predicate):
+            raise TypeError(f'Expected Predicate, not {typename(other)}')
+        decided = True
+        for clause in self.clauses:
+            if isinstance(clause, _Members):
+                if not clause.within(other):
+                    return False
+            elif not any(clause.within(candidate) for candidate in other.clauses):
+                # several clauses may still cover this one together
+                covered = _covered(clause, other)
+                if covered is False:
+                    return False
+                if covered is None:
+                    decided = None
+        return decided
+
+    def __le__(self, other):
+        if not isinstance(other, Predicate):
+            return NotImplemented
+        # only what can be shown to hold is reported as holding
+        return Predicate.subset_of(self, other) is True
+
+    def __ge__(self, other):
+        if not isinstance(other, Predicate):
+            return NotImplemented
+        # calling through the class avoids bouncing back here when other is a subclass
+        return Predicate.subset_of(other, self) is True
+
+    def __eq__(self, other):
+        if not isinstance(other, Predicate):
+            return False
+        return Predicate.__le__(self, other) and Predicate.__le__(other, self)
+
+    __hash__ = None
+
+
+def _covered(clause, other):
+    # only clauses of the same kind or a broader one can take in a clause's members
+    kind, test = clause.kind, other.test
+    covering = [c for c in other.clauses if isinstance(c, _Clause) and issubclass(kind, c.kind)]
+    if issubclass(kind, bool):
+        return all(test(value) for value in (False, True) if clause.test(value))
+    if issubclass(kind, int):
+        points = {
+            int(value.real) for c in other.clauses if isinstance(c, _Members) for value in c.elements
+            if isinstance(value, (int, float, complex)) and value == value.real and value.real == floor(value.real)
+        }
+        return _integers_covered(clause, covering, points, test)
+    if clause.interval is None:
+        # whatever the clause holds beyond the real line, nan included, needs a clause as broad
+        return any(c.interval is None for c in covering)
+    intervals = [_REAL_LINE if c.interval is None else c.interval for c in covering]
+    return _interval_covered(clause.interval, intervals, lambda point: test(kind(point)))
+
+
+def _interval_covered(interval, intervals, test):
+    # the covering intervals change only at their ends, so checking each end and a point
+    # strictly between each pair of neighbouring ends settles it
+    ends = sorted({
+        end for i in intervals for end in (i.low, i.high) if interval.contains(end)
+    } | {end for end in (interval.low, interval.high) if abs(end) < inf})
+    points = [end for end in ends if interval.contains(end)]
+    bounds = [interval.low, *ends, interval.high]
+    for a, b in zip(bounds, bounds[1:]):
+        if a < b:
+            if abs(a) < inf and abs(b) < inf:
+                points.append((a + b) / 2)
+            else:
+                points.append(b - 1 if abs(b) < inf else a + 1 if abs(a) < inf else 0)
+    for point in points:
+        if interval.contains(point) and not any(i.contains(point) for i in intervals) and not test(point):
+            return False
+    return True
+
+
+def _integers_covered(clause, covering, points, test):
+    interval = _REAL_LINE if clause.interval is None else clause.interval
+    classes = ((0, 1),) if clause.residues is None else clause.residues.classes
+    pieces = [
+        (None if c.interval is None else c.interval.integral(), ((0, 1),) if c.residues is None else c.residues.classes)
+        for c in covering
+    ]
+    # between consecutive breaks the covering pieces stay the same, and every integer that
+    # other lists on its own gets a break of its own
+    breaks = {interval.low, interval.high + 1}
+    for piece, _ in pieces:
+        if piece is not None:
+            breaks.update(end for end in (piece.low, piece.high + 1) if abs(end) < inf)
+    for point in points:
+        breaks.update((point, point + 1))
+    breaks = sorted(end for end in breaks if interval.low <= end <= interval.high + 1)
+    decided = True
+    for low, stop in zip(breaks, breaks[1:]):
+        high = stop - 1
+        if low == high:
+            if any(low % m == r for r, m in classes) and not test(clause.kind(low)):
+                return False
+            continue
+        inside = low if abs(low) < inf else high if abs(high) < inf else 0
+        active = [c for piece, cs in pieces if piece is None or piece.contains(inside) for c in cs]
+        for a in classes:
+            covered = _class_covered(a, active, low, high)
+            if covered is False:
+                return False
+            if covered is None:
+                decided = None
+    return decided
+
+
+class Type(Predicate):
+
+    def __init__(self, *kinds):
+        if not all(isinstance(kind, type) for kind in kinds):
+            raise TypeError(f'Expected types, not {", ".join(typename(kind) for kind in kinds if not isinstance(kind, type))}')
+        super().__init__(_Clause(kind) for kind in kinds)
+
+
+class Interval(Predicate):
+
+    def __init__(self, low=-inf, high=inf, low_closed=True, high_closed=True):
+        interval = _Interval(low, high, low_closed, high_closed)
+        super().__init__(_Clause(kind, interval) for kind in (int, float, complex))
+
+
+class Congruence(Predicate):
+
+    def __init__(self, modulus, residue=0):
+        if not (isinstance(modulus, int) and modulus > 0):
+            raise ValueError(f'Expected a positive modulus, not {modulus}')
+        super().__init__((_Clause(int, None, _Residues(((residue, modulus),))),))
+
+
+class Members(Predicate):
+
+    def __init__(self, *elements):
+        super().__init__((_Members(elements),))
@@ -0,0 +1,89 @@
+import random
+
+from .utils import typename
+
+
+EVICTION_POLICIES = ('lru', 'reservoir', 'first')
+
+
+class SampleCache:
+
+	def __init__(self, maxsize=None, policy='lru', seed=None):
+		if maxsize is not None and not (isinstance(maxsize, int) and maxsize > 0):
+			raise ValueError(f'Expected a positive cache size, not {maxsize}')
+		if policy not in EVICTION_POLICIES:
+			raise ValueError(f'Expected one of {EVICTION_POLICIES}, not {policy}')
+		self.maxsize = maxsize
+		self.policy = policy
+		self.rng = random.Random(seed)
+		self.on_evict = None
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		# dicts keep insertion order, which doubles as recency order under lru
+		self._samples = {}
+		# reservoir sampling needs to pick a uniformly random victim in constant time
+		self._slots = []
+
+	def __repr__(self):
+		return f'{typename(self)}(maxsize={self.maxsize}, policy={self.policy!r}, size={len(self)})'
+
+	def __len__(self):
+		return len(self._samples)
+
+	def __iter__(self):
+		return iter(self._samples)
+
+	def __contains__(self, sample):
+		return sample in self._samples
+
+	def __and__(self, other):
+		return self._samples.keys() & other
+
+	def __sub__(self, other):
+		return self._samples.keys() - other
+
+	@property
+	def stats(self):
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'evictions': self.evictions,
+			'size': len(self),
+			'maxsize': self.maxsize
+		}
+
+	def add(self, sample):
+		if sample in self._samples:
+			self.hits += 1
+			if self.policy == 'lru':
+				self._samples[sample] = self._samples.pop(sample)
+			return
+		self.misses += 1
+		if self.maxsize is None or len(self) < self.maxsize:
+			self._insert(sample)
+			return
+		if self.policy == 'lru':
+			self._evict(next(iter(self._samples)))
+			self._insert(sample)
+		elif self.policy == 'reservoir':
+			# the k-th distinct sample displaces a random resident with probability maxsize/k
+			slot = self.rng.randrange(self.misses)
+			if slot < self.maxsize:
+				self._evict(self._slots[slot])
+				self._insert(sample)
+
+	def _insert(self, sample):
+		self._samples[sample] = len(self._slots)
+		self._slots.append(sample)
+
+	def _evict(self, sample):
+		# swapping the last slot into the vacated one keeps every slot filled
+		slot = self._samples.pop(sample)
+		last = self._slots.pop()
+		if not slot == len(self._slots):
+			self._slots[slot] = last
+			self._samples[last] = slot
+		self.evictions += 1
+		if self.on_evict is not None:
+			self.on_evict(sample)
@@ -0,0 +1,78 @@
+from array import array
+
+from .utils import typename
+
+
+def _typecode(n):
+	for code in ('B', 'H', 'I', 'L', 'Q'):
+		if n <= 1 << (8 * array(code).itemsize):
+			return code
+	raise OverflowError(f'Cannot index a table of {n} elements')
+
+
+class CayleyTable:
+
+	def __init__(self, elements, cells, index=None):
+		self.elements = tuple(elements)
+		self.order = len(self.elements)
+		# an index handed over by the domain is shared rather than rebuilt
+		self.index = index if index is not None else {element: i for i, element in enumerate(self.elements)}
+		if not len(self.index) == self.order:
+			raise ValueError('Expected the elements of a table to be distinct')
+		self.cells = array(_typecode(self.order), cells)
+		if not len(self.cells) == self.order ** 2:
+			raise ValueError(f'Expected {self.order ** 2} table cells, not {len(self.cells)}')
+		self._left_division = None
+		self._right_division = None
+
+	def __repr__(self):
+		return f'{typename(self)}{self.elements}'
+
+	def __call__(self, i, j):
+		return self.cells[i*self.order + j]
+
+	def lookup(self, a, b):
+		return self.elements[self.cells[self.index[a]*self.order + self.index[b]]]
+
+	def _division(self, rows):
+		n = self.order
+		cells = array(self.cells.typecode, bytes(self.cells.itemsize * n**2))
+		for i in range(n):
+			seen = bytearray(n)
+			for j in range(n):
+				product = self.cells[i*n + j] if rows else self.cells[j*n + i]
+				if seen[product]:
+					side = 'left' if rows else 'right'
+					raise ValueError(f'{self.elements[product]} has no unique {side} quotient by {self.elements[i]}')
+				seen[product] = 1
+				cells[product*n + i] = j
+		return CayleyTable(self.elements, cells, self.index)
+
+	def left_division(self):
+		# read as left_division(c, a), the x for which a*x == c
+		if self._left_division is None:
+			self._left_division = self._division(rows=True)
+		return self._left_division
+
+	def right_division(self):
+		# read as right_division(c, b), the y for which y*b == c
+		if self._right_division is None:
+			self._right_division = self._division(rows=False)
+		return self._right_division
+
+	def indices_of(self, samples):
+		return [self.index[sample] for sample in samples]
+
+	def latin_square_counterexample(self, indices, singletons):
+		for (i,) in singletons:
+			row, column = bytearray(self.order), bytearray(self.order)
+			for j in indices:
+				product = self.cells[i*self.order + j]
+				if row[product]:
+					return i, j
+				row[product] = 1
+				product = self.cells[j*self.order + i]
+				if column[product]:
+					return j, i
+				column[product] = 1
+		return None
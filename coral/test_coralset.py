@@ -1,7 +1,8 @@
 
-from pytest import fixture, raises
+from pytest import fixture, raises, importorskip
 
 from .coralset import *
+from .predicates import Type, Interval
 
 @fixture
 def Z():
@@ -177,6 +178,68 @@ class TestCoralSet:
         with raises(ValueError):
             assert CoralSet(float).elements == (1, 2, 3, 4).elements
 
+    def test_union_is_deduplicated(self):
+        union = CoralSet((1, 2, 3)) | CoralSet((3, 4))
+        assert union.elements == (1, 2, 3, 4)
+        assert len(union._underlying) == 1
+
+    def test_intersection(self):
+        assert CoralSet((1, 2, 3)) & CoralSet((3, 4)) == CoralSet((3,))
+        assert CoralSet((1, 2, 3)) & CoralSet((4,)) == CoralSet(())
+        assert CoralSet((1.5, 2)) & INTEGERS == CoralSet((2,))
+        assert INTEGERS & CoralSet((1.5, 2)) == CoralSet((2,))
+        with raises(ValueError):
+            INTEGERS & REALS
+
+    def test_difference(self):
+        assert CoralSet((1, 2, 3)) - CoralSet((3, 4)) == CoralSet((1, 2))
+        assert CoralSet((1, 2.5)) - INTEGERS == CoralSet((2.5,))
+        with raises(ValueError):
+            INTEGERS - CoralSet((1,))
+
+    def test_symmetric_difference(self):
+        assert CoralSet((1, 2, 3)) ^ CoralSet((3, 4)) == CoralSet((1, 2, 4))
+        with raises(ValueError):
+            CoralSet((1,)) ^ INTEGERS
+
+    def test_comparisons(self):
+        small, big = CoralSet((1, 2)), CoralSet((1, 2, 3))
+        assert small <= big and small < big
+        assert big <= big and not big < big
+        assert big >= small and big > small
+        assert not CoralSet((1, 4)) <= big
+        assert small <= INTEGERS and small < INTEGERS
+        assert EVEN_INTEGERS < INTEGERS
+        assert INTEGERS <= INTEGERS
+
+    def test_subset_tests_stop_at_size(self):
+        assert not CoralSet((1, 2)).has_subset(CoralRange(10**8))
+        assert CoralRange(10**8).has_subset(CoralSet((5, 6)))
+
+    def test_iterates_distinct_elements(self):
+        union = CoralSet((1, 2, 3)) | CoralSet((3, 4))
+        assert list(union) == [1, 2, 3, 4]
+        assert len(union) == 4
+        assert list(CoralSet(([1], [2], [1]))) == [[1], [2]]
+        assert len(CoralSet(([1], [2], [1]))) == 2
+
+    def test_iteration_is_lazy(self):
+        elements = CoralRange(10**8).iter_elements()
+        assert next(elements) == 0
+        assert next(elements) == 1
+
+    def test_refuses_to_iterate_infinite_sets(self):
+        with raises(ValueError):
+            iter(INTEGERS)
+        with raises(ValueError):
+            len(REALS)
+
+    def test_truthiness(self):
+        assert INTEGERS
+        assert CoralSet((0,))
+        assert not CoralSet(())
+        assert not CoralRange(0)
+
     def test_is_subset_for_custom_coralsets(self):
         assert POSITIVE_REALS.is_subset(REALS)
         assert EVEN_INTEGERS.is_subset(INTEGERS)
@@ -184,3 +247,219 @@ class TestCoralSet:
     def test_has_subset_for_custom_coralsets(self):
         assert REALS.has_subset(POSITIVE_REALS)
         assert INTEGERS.has_subset(EVEN_INTEGERS)
+
+    def test_decides_custom_coralset_relations_symbolically(self):
+        assert EVEN_INTEGERS < INTEGERS < REALS < COMPLEX
+        assert POSITIVE_REALS < REALS
+        assert not EVEN_INTEGERS.is_subset(POSITIVE_REALS)
+        assert not INTEGERS.has_subset(REALS)
+        assert INTEGERS == CoralSet(int)
+        assert not COMPLEX == REALS
+
+    def test_checks_finite_subsets_of_custom_coralsets_by_membership(self):
+        assert EVEN_INTEGERS.has_subset(CoralSet((2, 4)))
+        assert not EVEN_INTEGERS.has_subset(CoralSet((1, 3)))
+        assert not POSITIVE_REALS.has_subset(CoralSet((-1.5,)))
+
+    def test_decides_unions_of_adjacent_predicates(self):
+        def custom(low, high):
+            meta = type('IntegerRange', (CustomCoralSet,), {'PREDICATE': Type(int) & Interval(low, high)})
+            return CoralSet(meta('IntegerRange', (), {}))
+        union, whole = custom(0, 1) | custom(1, 2), custom(0, 2)
+        assert union == whole
+        assert not whole.has_subset(union)
+        assert not union.has_subset(whole)
+        assert whole.has_subset(custom(0, 1))
+
+    def test_compiles_predicate_membership(self):
+        is_even = EVEN_INTEGERS.membership_test()
+        assert is_even(4) and not is_even(3) and not is_even(4.0)
+        assert 1 + 0j in REALS
+        assert 1 + 1j not in REALS
+
+    def test_caches_membership_by_type_for_type_only_sets(self, R):
+        assert 1 in R
+        assert 1.5 in R
+        assert 1j not in R
+        assert R._type_cache == {int: True, float: True, complex: False}
+        assert 3 in INTEGERS
+        assert 3.0 not in INTEGERS
+        assert INTEGERS._type_cache[int] and not INTEGERS._type_cache[float]
+
+    def test_does_not_cache_membership_judged_by_a_metaclass(self):
+        class OddMeta(type):
+            def __instancecheck__(cls, candidate):
+                return isinstance(candidate, int) and candidate % 2 == 1
+        class Odd(metaclass=OddMeta):
+            ...
+        odds = CoralSet(Odd)
+        assert 3 in odds
+        assert 4 not in odds
+        assert odds._type_cache == {}
+        assert odds.contains_many([1, 2, 5]) == [True, False, True]
+
+    def test_does_not_cache_value_dependent_membership(self):
+        assert 2 in EVEN_INTEGERS
+        assert 3 not in EVEN_INTEGERS
+        assert -1 not in POSITIVE_REALS
+        assert EVEN_INTEGERS._type_cache == {}
+        assert 1 in CoralSet(int) | CoralSet((0.5,))
+        assert 0.5 in CoralSet(int) | CoralSet((0.5,))
+        assert 0.25 not in CoralSet(int) | CoralSet((0.5,))
+
+    def test_membership_test_agrees_with_in(self, R):
+        for cset in (R, INTEGERS, EVEN_INTEGERS, CoralSet((1, 2, 3))):
+            is_member = cset.membership_test()
+            for candidate in (0, 1, 2, 2.5, 1j, -4):
+                assert is_member(candidate) == (candidate in cset)
+
+    def test_indexes_finite_elements(self):
+        discrete = CoralSet((3, 1, 2)) | CoralSet((1, 4))
+        assert discrete.index_of(3) == 0
+        assert discrete.index_of(4) == 3
+        with raises(ValueError):
+            discrete.index_of(5)
+        with raises(ValueError):
+            CoralSet(int).index_of(1)
+
+    def test_hashed_membership_handles_unhashable_candidates(self):
+        discrete = CoralSet((1, 2, 3))
+        assert [1, 2] not in discrete
+        assert discrete.membership_test()(2)
+        assert not discrete.membership_test()({})
+
+    def test_unhashable_elements_fall_back_to_scanning(self):
+        lists = CoralSet(([1], [2]))
+        assert [1] in lists
+        assert [3] not in lists
+        with raises(TypeError):
+            lists.index_of([1])
+
+
+class TestCoralRange:
+
+    def test_membership(self):
+        evens = CoralRange(0, 10, 2)
+        assert 4 in evens
+        assert 4.0 in evens
+        assert 5 not in evens
+        assert 10 not in evens
+        assert 4.5 not in evens
+        assert 'a' not in evens
+        assert float('inf') not in evens
+        assert evens.membership_test()(8)
+
+    def test_does_not_store_elements(self):
+        big = CoralRange(10**8)
+        assert len(big) == 10**8
+        assert 10**8 - 1 in big
+        assert big.index_of(12345) == 12345
+
+    def test_eq(self):
+        assert CoralRange(3) == CoralRange(0, 3, 1)
+        assert CoralRange(3) == CoralRange(2, -1, -1)
+        assert CoralRange(0, 3) == CoralSet((0, 1, 2))
+        assert CoralSet((0, 1, 2)) == CoralRange(0, 3)
+        assert not CoralRange(3) == CoralSet((0, 1, 5))
+        assert not CoralRange(3) == INTEGERS
+
+    def test_or(self):
+        assert repr(CoralRange(0, 5) | CoralRange(5, 10)) == 'CoralRange(0, 10, 1)'
+        assert repr(CoralRange(0, 10, 2) | CoralRange(4, 20, 2)) == 'CoralRange(0, 19, 2)'
+        union = CoralRange(0, 10, 2) | CoralRange(1, 10, 2)
+        assert not isinstance(union, CoralRange)
+        assert all(n in union for n in range(10))
+        assert 7 in CoralRange(3) | CoralSet((7,))
+
+    def test_or_with_empty_ranges(self):
+        assert CoralRange(0) | CoralRange(-5, 0) == CoralRange(-5, 0)
+        assert CoralRange(-5, 0) | CoralRange(0) == CoralRange(-5, 0)
+        assert -3 in CoralRange(0) | CoralRange(-5, 0)
+
+    def test_has_subset(self):
+        assert CoralRange(30).has_subset(CoralRange(0, 30, 3))
+        assert not CoralRange(0, 30, 2).has_subset(CoralRange(0, 30, 3))
+        assert not CoralRange(30).has_subset(CoralRange(30))
+        assert CoralRange(5).has_subset(CoralSet((1, 2)))
+        assert not CoralRange(5).has_subset(CoralSet((1, 2, 9)))
+        assert CoralRange(3).is_subset(CoralSet((0, 1, 2, 3)))
+        assert CoralRange(3).is_subset(INTEGERS)
+
+
+class TestFrozenCoralSet:
+
+    def test_interns_structurally_identical_sets(self):
+        assert FrozenCoralSet((1, 2, 3)) is FrozenCoralSet((3, 2, 1))
+        assert FrozenCoralSet((1, 2)) is FrozenCoralSet((1,), (2, 1))
+        assert FrozenCoralSet(int, float) is FrozenCoralSet(float, int)
+        assert CoralSet((1, 2)).frozen() is FrozenCoralSet((2, 1))
+        assert FrozenCoralSet((1, 2)) is not FrozenCoralSet((1, 3))
+
+    def test_hashable(self):
+        lookup = {FrozenCoralSet((1, 2)): 'pair', FrozenCoralSet(int): 'integers'}
+        assert lookup[FrozenCoralSet((2, 1))] == 'pair'
+        assert lookup[FrozenCoralSet(int)] == 'integers'
+
+    def test_eq(self):
+        assert FrozenCoralSet((1, 2)) == FrozenCoralSet((2, 1))
+        assert not FrozenCoralSet((1, 2)) == FrozenCoralSet((1, 2, 3))
+        assert FrozenCoralSet((1, 2)) == CoralSet((1, 2))
+        assert CoralSet((1, 2)) == FrozenCoralSet((1, 2))
+        assert FrozenCoralSet(int) == FrozenCoralSet(INTEGERS._underlying[0])
+        assert FrozenCoralSet(int, (1,)) == FrozenCoralSet(int)
+        assert hash(FrozenCoralSet(int, (1,))) == hash(FrozenCoralSet(int))
+
+    def test_immutable(self):
+        with raises(AttributeError):
+            FrozenCoralSet((1, 2)).is_infinite = True
+
+    def test_refuses_unhashable_elements(self):
+        with raises(TypeError):
+            FrozenCoralSet(([1], [2]))
+
+    def test_memoizes_subset_relations(self):
+        parent, child = FrozenCoralSet((1, 2, 3)), FrozenCoralSet((1, 2))
+        assert parent.has_subset(child)
+        assert parent._relations['has_subset', id(child)][1]
+        assert child.is_subset(parent)
+        assert child <= parent and child < parent
+        assert not parent <= child
+
+    def test_algebra_stays_frozen(self):
+        a, b = FrozenCoralSet((1, 2, 3)), FrozenCoralSet((3, 4))
+        assert a | b is FrozenCoralSet((1, 2, 3, 4))
+        assert a & b is FrozenCoralSet((3,))
+        assert a - b is FrozenCoralSet((1, 2))
+        assert isinstance(FrozenCoralSet(int) | FrozenCoralSet(float), FrozenCoralSet)
+
+
+class TestBulkMembership:
+
+    def test_contains_many(self):
+        assert INTEGERS.contains_many([1, 1.5, -3]) == [True, False, True]
+        assert CoralSet((1, 2)).contains_many([2, 3, [1]]) == [True, False, False]
+        assert CoralRange(0, 10, 2).contains_many([4, 4.0, 5]) == [True, True, False]
+
+    def test_first_violation(self):
+        assert EVEN_INTEGERS.first_violation([2, 4, 5, 7]) == (2, 5)
+        assert EVEN_INTEGERS.first_violation([2, 4]) is None
+        assert CoralSet((1, 2)).first_violation(iter([1, 3])) == (1, 3)
+
+    def test_all_in(self):
+        assert REALS.all_in([1, 2.5, 3 + 0j])
+        assert not REALS.all_in([1, 2j])
+
+    def test_vectorized_masks_agree_with_membership(self):
+        numpy = importorskip('numpy')
+        arrays = (
+            numpy.array([0, 1, 2, 3, -4, 10**12]),
+            numpy.array([0.0, 1.5, 2.0, -3.0, float('nan'), float('inf')]),
+            numpy.array([1 + 0j, 1j, -2 + 0j]),
+            numpy.array([True, False])
+        )
+        for cset in (INTEGERS, REALS, EVEN_INTEGERS, POSITIVE_REALS, CoralRange(0, 10, 2), CoralSet((1, 2.0, 'x'))):
+            for array in arrays:
+                mask = cset.contains_many(array)
+                assert isinstance(mask, numpy.ndarray)
+                assert mask.tolist() == [candidate in cset for candidate in array.tolist()]
+        assert EVEN_INTEGERS.first_violation(numpy.array([2, 4, 5])) == (2, 5)
@@ -1,5 +1,5 @@
 
-from pytest import raises
+from pytest import raises, importorskip
 
 from .maps import *
 
@@ -29,6 +29,85 @@ class TestFunction:
 		with raises(TypeError):
 			assert Function(lambda x: x, [REALS])(1, y=2) == 1
 
+	def test_rejects_kwarg_parameters(self):
+		with raises(ValueError):
+			_ = Function(lambda x, y=1: x*y, [REALS])
+		with raises(ValueError):
+			_ = Function(lambda x, *, y: x*y, [REALS, REALS])
+
+
+	def test_maps_over_operand_sequences(self):
+		product = Function(lambda x, y: x*y, [REALS, REALS])
+		assert product.map([1, 2, 3], (4, 5, 6)) == [4, 10, 18]
+		assert product.map([], []) == []
+
+	def test_domains_judged_by_a_metaclass(self):
+		class OddMeta(type):
+			def __instancecheck__(cls, candidate):
+				return isinstance(candidate, int) and candidate % 2 == 1
+		class Odd(metaclass=OddMeta):
+			...
+		odd_product = AssociativeOperation(lambda a, b: a*b, CoralSet(Odd))
+		assert odd_product(3, 5) == 15
+		with raises(DomainError):
+			_ = odd_product(2, 3)
+
+	def test_map_checks_domains_in_bulk(self):
+		with raises(DomainError):
+			_ = Function(lambda x: x**2, [REALS]).map([1, 2, 1j])
+		with raises(ValueError):
+			_ = Function(lambda x, y: x*y, [REALS, REALS]).map([1, 2], [3])
+		with raises(TypeError):
+			_ = Function(lambda x, y: x*y, [REALS, REALS]).map([1, 2])
+
+	def test_map_evaluates_arrays_in_one_call(self):
+		numpy = importorskip('numpy')
+		calls = []
+		def square(x):
+			calls.append(x)
+			return x**2
+		squares = Function(square, [REALS]).map(numpy.arange(100.0))
+		assert isinstance(squares, numpy.ndarray)
+		assert squares.tolist() == [x**2 for x in range(100)]
+		assert len(calls) <= 5
+
+	def test_map_keeps_integers_exact(self):
+		numpy = importorskip('numpy')
+		product = Function(lambda x, y: x*y, [REALS, REALS])
+		results = product.map(numpy.array([1, 2, 3, 4, 2**40]), numpy.array([1, 1, 1, 1, 2**40]))
+		assert list(results) == [1, 2, 3, 4, 2**80]
+
+	def test_map_falls_back_to_a_loop(self):
+		numpy = importorskip('numpy')
+		larger = Function(lambda x, y: x if x > y else y, [REALS, REALS])
+		assert larger.map(numpy.array([1, 5]), numpy.array([3, 2])) == [3, 5]
+		assert larger.accepts_arrays is False
+
+
+class TestSignatures:
+
+	def test_counts_parameters_by_kind(self):
+		def f(x, y, z=1, *, w=2):
+			return x
+		assert num_args(f) == 2
+		assert num_kwargs(f) == 2
+		assert has_kwargs(f)
+		assert num_args(lambda *args: args) == 1
+		assert not has_kwargs(lambda x, y: x)
+
+	def test_ignores_equals_signs_inside_defaults(self):
+		def f(x, label='a=b'):
+			return x
+		assert num_kwargs(f) == 1
+		assert num_args(f) == 1
+
+	def test_handles_builtins_and_callable_objects(self):
+		assert num_args(divmod) == 2
+		assert num_args(Function(lambda x, y: x + y, [REALS, REALS])) == 1
+
+	def test_closures_sharing_code_share_arities(self):
+		assert num_args(addition_mod(3)._func) == num_args(addition_mod(4)._func) == 2
+
 
 class TestAssociativeOperation:
 
@@ -44,6 +123,63 @@ class TestAssociativeOperation:
 			_ = real_division(3, 4)
 			_ = real_division(5, 6)
 
+	def test_only_checks_triples_involving_new_samples(self):
+		evaluations = []
+		def add(a, b):
+			evaluations.append((a, b))
+			return a + b
+		real_addition = AssociativeOperation(add, REALS)
+		_ = real_addition(1, 2)
+		_ = real_addition(3, 4)
+		del evaluations[:]
+		_ = real_addition(1, 4)
+		assert evaluations == [(1, 4)]
+
+	def test_failing_samples_are_rechecked(self):
+		real_division = AssociativeOperation(lambda a, b: a / b, REALS)
+		_ = real_division(1, 2)
+		with raises(AssociativityError):
+			_ = real_division(3, 4)
+		with raises(AssociativityError):
+			_ = real_division(1, 2)
+
+	def test_reports_counterexample(self):
+		real_subtraction = AssociativeOperation(lambda a, b: a - b, REALS)
+		assert real_subtraction.associativity_counterexample((1, 2, 3)) is not None
+		assert real_subtraction.associativity_counterexample((1, 2, 3), verified=(1, 2, 3)) is None
+		_ = real_subtraction(1, 2)
+		with raises(AssociativityError, match='e.g. at'):
+			_ = real_subtraction(3, 4)
+
+	def test_vectorized_verification_agrees_with_scalar_verification(self):
+		importorskip('numpy')
+		modular_addition = addition_mod(20)
+		assert modular_addition.is_associative(range(20))
+		assert modular_addition.accepts_arrays
+		real_subtraction = ClosedOperation(lambda a, b: a - b, REALS)
+		a, b, c = real_subtraction.associativity_counterexample([0.5*i for i in range(12)])
+		assert not (a - b) - c == a - (b - c)
+		assert real_subtraction.accepts_arrays
+
+	def test_checks_triples_with_repeated_elements(self):
+		real_subtraction = ClosedOperation(lambda a, b: a - b, REALS)
+		assert not real_subtraction.is_associative((1, 2))
+
+	def test_computes_each_composition_once(self):
+		evaluations = []
+		def add_mod_5(a, b):
+			evaluations.append((a, b))
+			return (a + b) % 5
+		operation = ClosedOperation(add_mod_5, CoralSet(range(5)))
+		assert operation.is_associative(range(5))
+		assert len(evaluations) == len(set(evaluations)) == 25
+
+	def test_falls_back_to_scalar_verification(self):
+		real_maximum = ClosedOperation(lambda a, b: a if a > b else b, REALS)
+		assert real_maximum.is_associative(range(12))
+		assert real_maximum.is_commutative(range(12))
+		assert not real_maximum.accepts_arrays
+
 
 class TestCommutativeOperation:
 
@@ -51,6 +187,15 @@ class TestCommutativeOperation:
 		real_addition = CommutativeOperation(lambda a, b: a + b, REALS)
 		_ = real_addition(1, 2)
 
+	def test_checks_each_unordered_pair_once(self):
+		evaluations = []
+		def multiply(a, b):
+			evaluations.append((a, b))
+			return a*b
+		real_multiplication = CommutativeOperation(multiply, REALS)
+		assert real_multiplication.is_commutative(range(6))
+		assert len(evaluations) == 6*5
+
 	def test_subtraction_fails_commutativity(self):
 		real_subtraction = CommutativeOperation(lambda a, b: a - b, REALS)
 		with raises(CommutativityError):
@@ -88,4 +233,306 @@ class TestAssociativeAbelianOperation:
 			_ = operation(5, 6)
 
 
+class TestTabulatedOperation:
+
+	def test_tabulated_operation_reads_from_table(self):
+		evaluations = []
+		def add_mod_5(a, b):
+			evaluations.append((a, b))
+			return (a + b) % 5
+		operation = ClosedOperation(add_mod_5, CoralSet(range(5))).tabulate()
+		assert len(evaluations) == 25
+		assert operation(3, 4) == 2
+		assert operation.is_associative(range(5))
+		assert operation.is_commutative(range(5))
+		assert len(evaluations) == 25
+
+	def test_tabulated_modular_operation_is_invertible(self):
+		operation = addition_mod(6).tabulate()
+		assert operation(5, 5) == 4
+		assert operation.is_left_invertible(range(6))
+		assert operation.is_right_invertible(range(6))
+
+	def test_quotients_come_from_the_table(self):
+		subtractions = []
+		def subtract_mod_6(a, b):
+			subtractions.append((a, b))
+			return (a - b) % 6
+		operation = InvertibleOperation(lambda a, b: (a + b) % 6, subtract_mod_6, CoralSet(range(6))).tabulate()
+		del subtractions[:]
+		assert operation.left_divide(1, 4) == 3
+		assert operation.right_divide(1, 4) == 3
+		assert operation.is_left_invertible(range(6))
+		assert operation.is_right_invertible(range(6))
+		assert subtractions == []
+
+	def test_untabulated_operations_divide_with_their_inverse(self):
+		real_addition = InvertibleOperation(lambda a, b: a + b, lambda a, b: a - b, REALS)
+		assert real_addition.left_divide(5, 2) == 3
+		assert real_addition.right_divide(5, 2) == 3
+		with raises(TypeError):
+			_ = ClosedOperation(lambda a, b: a + b, REALS).left_divide(5, 2)
+
+	def test_divisions_keep_no_samples(self):
+		real_addition = InvertibleOperation(lambda a, b: a + b, lambda a, b: a - b, REALS)
+		for n in range(100):
+			assert real_addition.left_divide(n, 1) == n - 1
+		assert real_addition._inverse.num_samples == 0
+		with raises(DomainError):
+			_ = real_addition.right_divide(1j, 2)
+
+	def test_group_operation_inverse(self):
+		modular_addition = GroupOperation(lambda a, b: (a + b) % 7, lambda a, b: (a - b) % 7, CoralSet(range(7)))
+		assert modular_addition.inverse(3) == 4
+		assert modular_addition.tabulate().inverse(3) == 4
+		assert modular_addition.inverse(0) == 0
+
+	def test_tabulation_checks_invertibility(self):
+		with raises(InvertibilityError):
+			_ = InvertibleOperation(lambda a, b: (a * b) % 4, lambda a, b: a, CoralSet(range(4))).tabulate()
+		with raises(InvertibilityError):
+			_ = InvertibleOperation(lambda a, b: (a + b) % 4, lambda a, b: a, CoralSet(range(4))).tabulate()
+		with raises(InvertibilityError):
+			_ = InvertibleOperation(lambda a, b: (a + b) % 40, lambda a, b: a, CoralRange(40)).sample_randomly(100, seed=0).tabulate()
+		assert addition_mod(40).sample_randomly(100, seed=0).tabulate().table is not None
+
+	def test_tabulated_operation_rejects_arguments_outside_domain(self):
+		operation = addition_mod(3).tabulate()
+		with raises(DomainError):
+			_ = operation(1, 3)
+
+	def test_tabulation_checks_closure(self):
+		with raises(ClosureError):
+			_ = ClosedOperation(lambda a, b: a + b, CoralSet(range(3))).tabulate()
+
+	def test_refuses_to_tabulate_infinite_domains(self):
+		with raises(ValueError):
+			_ = ClosedOperation(lambda a, b: a + b, REALS).tabulate()
+
+	def test_tabulated_operation_detects_non_associativity(self):
+		operation = AssociativeOperation(lambda a, b: (a - b) % 4, CoralSet(range(4))).tabulate()
+		_ = operation(1, 2)
+		with raises(AssociativityError):
+			_ = operation(3, 0)
+
+
+class TestRandomSampling:
+
+	def test_bounds_evaluations_per_call(self):
+		evaluations = []
+		def add(a, b):
+			evaluations.append((a, b))
+			return a + b
+		real_addition = AssociativeOperation(add, REALS).sample_randomly(checks=10, seed=0)
+		for i in range(30):
+			_ = real_addition(i, i + 1)
+		del evaluations[:]
+		_ = real_addition(100, 101)
+		assert len(evaluations) <= 1 + 4*10
+
+	def test_seeded_sampling_is_reproducible(self):
+		samples = [i/7 for i in range(40)]
+		first = ClosedOperation(lambda a, b: a - b, REALS).sample_randomly(checks=5, seed=3)
+		second = ClosedOperation(lambda a, b: a - b, REALS).sample_randomly(checks=5, seed=3)
+		assert first.associativity_counterexample(samples) == second.associativity_counterexample(samples)
+
+	def test_detects_non_associativity(self):
+		real_subtraction = AssociativeOperation(lambda a, b: a - b, REALS).sample_randomly(checks=50, seed=1)
+		_ = real_subtraction(1, 2)
+		with raises(AssociativityError):
+			_ = real_subtraction(3, 4)
+
+	def test_error_bound_shrinks_with_checks(self):
+		real_addition = ClosedOperation(lambda a, b: a + b, REALS).sample_randomly(checks=100, seed=0)
+		assert real_addition.is_associative(range(50))
+		assert real_addition.sampling.last_checked == 100
+		assert real_addition.sampling.error_bound(0.05) == (1 - 0.05) ** 100
+		with raises(ValueError):
+			_ = real_addition.sampling.error_bound(2)
+
+	def test_error_bound_per_axiom(self):
+		real_addition = GroupOperation(lambda a, b: a + b, lambda a, b: a - b, REALS).sample_randomly(checks=20, seed=0)
+		for i in range(10):
+			_ = real_addition(i, i + 0.5)
+		rounds = real_addition.sampling.rounds
+		assert set(rounds) == {'associative', 'left_invertible', 'right_invertible'}
+		assert real_addition.sampling.error_bound(0.1, 'associative') == 0.9 ** 20
+		assert real_addition.sampling.error_bound(0.1) == max(real_addition.sampling.error_bound(0.1, axiom) for axiom in rounds)
+		with raises(ValueError):
+			_ = real_addition.sampling.error_bound(0.1, 'commutative')
+
+	def test_small_sample_spaces_are_checked_exhaustively(self):
+		modular_addition = ClosedOperation(lambda a, b: (a + b) % 4, CoralSet(range(4))).sample_randomly(checks=1000)
+		assert modular_addition.is_associative(range(4))
+		assert modular_addition.sampling.last_checked == 4**3
+		assert modular_addition.sampling.error_bound(0.01) == 0.0
+
+	def test_rejects_invalid_budgets(self):
+		with raises(ValueError):
+			_ = ClosedOperation(lambda a, b: a + b, REALS).sample_randomly(checks=0)
+		with raises(ValueError):
+			_ = ClosedOperation(lambda a, b: a + b, REALS).sample_randomly(time_budget=-1)
+
+
+class TestValidationPolicy:
+
+	def test_eager_validation_is_the_default(self):
+		real_subtraction = AssociativeOperation(lambda a, b: a - b, REALS)
+		assert real_subtraction.validation == 'eager'
+
+	def test_deferred_validation_waits_for_validate(self):
+		real_subtraction = AssociativeOperation(lambda a, b: a - b, REALS)
+		real_subtraction.validation = 'deferred'
+		assert real_subtraction(1, 2) == -1
+		assert real_subtraction(3, 4) == -1
+		with raises(AssociativityError):
+			real_subtraction.validate()
+
+	def test_deferred_context_validates_on_exit(self):
+		real_subtraction = CommutativeOperation(lambda a, b: a - b, REALS)
+		with raises(CommutativityError):
+			with real_subtraction.deferred():
+				assert real_subtraction(1, 2) == -1
+				assert real_subtraction(2, 1) == 1
+		assert real_subtraction.validation == 'eager'
+
+	def test_deferred_context_passes_for_valid_operations(self):
+		real_addition = AssociativeAbelianOperation(lambda a, b: a + b, REALS)
+		with real_addition.deferred():
+			for i in range(10):
+				_ = real_addition(i, i + 1)
+		assert real_addition.num_samples == 11
+
+	def test_disabled_validation_keeps_no_samples(self):
+		real_subtraction = AssociativeOperation(lambda a, b: a - b, REALS)
+		real_subtraction.validation = 'off'
+		assert real_subtraction(1, 2) == -1
+		assert real_subtraction(3, 4) == -1
+		assert real_subtraction.num_samples == 0
+		assert real_subtraction.is_indempotent is None
+		with raises(DomainError):
+			_ = real_subtraction(1j, 2)
+
+	def test_rejects_unknown_policies(self):
+		with raises(ValueError):
+			AssociativeOperation(lambda a, b: a + b, REALS).validation = 'lazy'
+
+
+class TestParallelVerification:
+
+	def test_agrees_with_serial_verification(self):
+		modular_addition = addition_mod(12).parallelize(workers=2, threshold=4)
+		assert modular_addition.is_associative(range(12))
+		assert modular_addition.is_left_invertible(range(12))
+		assert modular_addition.is_right_invertible(range(12))
+
+	def test_reports_counterexample_involving_new_samples(self):
+		real_subtraction = ClosedOperation(lambda a, b: a - b, REALS).parallelize(workers=2, threshold=4)
+		a, b, c = real_subtraction.associativity_counterexample(range(10), verified=range(9))
+		assert 9 in (a, b, c)
+		assert not (a - b) - c == a - (b - c)
+
+	def test_falls_back_to_serial_for_small_inputs(self):
+		real_addition = AssociativeOperation(lambda a, b: a + b, REALS).parallelize(workers=2)
+		assert not real_addition.parallel.applies_to(3)
+		_ = real_addition(1, 2)
+		_ = real_addition(3, 4)
+
+	def test_counts_the_tuples_being_checked(self):
+		real_addition = AssociativeOperation(lambda a, b: a + b, REALS).parallelize(workers=2, threshold=100)
+		assert not real_addition._in_parallel(range(40), [40], 2)
+		assert real_addition._in_parallel(range(40), [40], 3)
+
+	def test_reuses_one_pool_across_checks(self):
+		modular_addition = addition_mod(12).parallelize(workers=2, threshold=4)
+		assert modular_addition.is_left_invertible(range(6))
+		executor = modular_addition.parallel._executor
+		assert modular_addition.is_left_invertible(range(12), verified=range(6))
+		assert modular_addition.parallel._executor is executor
+		modular_addition.parallel.close()
+
+	def test_rejects_invalid_pools(self):
+		with raises(ValueError):
+			_ = ClosedOperation(lambda a, b: a + b, REALS).parallelize(workers=0)
+
+
+class TestLatinSquareOperation:
+
+	def test_modular_addition_satisfies_latin_square_property(self):
+		modular_addition = LatinSquareOperation(lambda a, b: (a + b) % 7, CoralSet(range(7)))
+		assert modular_addition.satisfies_latin_square_property(range(7))
+		assert modular_addition.tabulate().satisfies_latin_square_property(range(7))
+
+	def test_checks_every_row_and_column(self):
+		modular_multiplication = LatinSquareOperation(lambda a, b: (a * b) % 4, CoralSet(range(4)))
+		assert not modular_multiplication.satisfies_latin_square_property(range(4))
+		assert not modular_multiplication.tabulate().satisfies_latin_square_property(range(4))
+		assert not modular_multiplication.satisfies_latin_square_property((1, 3, 2))
+
+	def test_evaluates_each_pair_once(self):
+		evaluations = []
+		def add_mod_9(a, b):
+			evaluations.append((a, b))
+			return (a + b) % 9
+		modular_addition = LatinSquareOperation(add_mod_9, CoralSet(range(9)))
+		assert modular_addition.satisfies_latin_square_property(range(9))
+		assert len(evaluations) == 81
+
+	def test_repeated_row_entries_fail_latin_square_property(self):
+		real_maximum = LatinSquareOperation(lambda a, b: a if a > b else b, REALS)
+		with raises(PropertyError):
+			_ = real_maximum(1, 2)
+
+
+class TestBoundedSamples:
+
+	def test_sample_cache_stays_bounded(self):
+		real_addition = AssociativeAbelianOperation(lambda a, b: a + b, REALS).bound_samples(8)
+		for i in range(100):
+			_ = real_addition(i, i + 1)
+		assert real_addition.num_samples == 8
+		assert real_addition.cached_samples.stats['evictions'] == 101 - 8
+		assert all(len(verified) <= 8 for verified in real_addition._verified.values())
+
+	def test_evicted_samples_leave_indempotents(self):
+		real_maximum = ClosedOperation(lambda a, b: a if a > b else b, REALS).bound_samples(2)
+		_ = real_maximum(1, 1)
+		assert real_maximum.indempotents == {1}
+		_ = real_maximum(2, 3)
+		assert real_maximum.indempotents == {3}
+		assert real_maximum.is_indempotent is False
+
+	def test_bounding_keeps_existing_samples(self):
+		real_addition = AssociativeOperation(lambda a, b: a + b, REALS)
+		_ = real_addition(1, 2)
+		_ = real_addition.bound_samples(10, 'first')
+		assert set(real_addition.cached_samples) == {1, 2}
+
+
+class TestBatchedApplication:
+
+	def test_applies_operation_to_many_pairs(self):
+		add = addition_mod(7)
+		assert add.apply_many(range(7), [3]*7) == [3, 4, 5, 6, 0, 1, 2]
+		assert add.num_samples == 7
+
+	def test_tabulated_operation_applies_many_pairs(self):
+		add = addition_mod(7).tabulate()
+		assert add.apply_many([1, 2], (n for n in (3, 6))) == [4, 1]
+		with raises(DomainError):
+			_ = add.apply_many([1, 9], [1, 1])
+
+	def test_checks_closure_over_the_batch(self):
+		bounded_addition = ClosedOperation(lambda a, b: a + b, CoralRange(5))
+		with raises(ClosureError):
+			_ = bounded_addition.apply_many([1, 3], [2, 2])
+
+	def test_validates_each_batch_once(self):
+		real_division = AssociativeOperation(lambda a, b: a / b, REALS)
+		with raises(AssociativityError):
+			_ = real_division.apply_many([1, 2, 3], [2, 3, 4])
 
+	def test_records_indempotents(self):
+		real_maximum = ClosedOperation(lambda a, b: a if a > b else b, REALS)
+		_ = real_maximum.apply_many([1, 5], [3, 2])
+		assert real_maximum.indempotents == {3, 5}
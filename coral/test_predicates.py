@@ -0,0 +1,98 @@
+from math import inf
+
+from pytest import raises
+
+from .predicates import *
+
+
+class TestPredicate:
+
+    def test_type(self):
+        numbers = Type(int, float)
+        assert numbers(1) and numbers(1.5)
+        assert not numbers(1j)
+        assert not numbers('1')
+
+    def test_interval(self):
+        unit = Interval(0, 1, low_closed=False)
+        assert unit(1) and unit(0.5) and unit(0.5 + 0j)
+        assert not unit(0)
+        assert not unit(0.5 + 1j)
+        assert not unit('a')
+        assert Interval()(-10**100)
+
+    def test_congruence(self):
+        odd = Congruence(2, 1)
+        assert odd(3) and odd(-1)
+        assert not odd(4)
+        assert not odd(3.0)
+        with raises(ValueError):
+            Congruence(0)
+
+    def test_members(self):
+        assert Members(1, 'a')('a')
+        assert not Members(1, 'a')([1])
+
+    def test_conjunction(self):
+        small_evens = Congruence(2) & Interval(0, 10)
+        assert small_evens(4)
+        assert not small_evens(12)
+        assert not small_evens(3)
+        assert (Congruence(6) & Congruence(4)) == Congruence(12)
+        assert (Type(int) & Type(float)) == Predicate()
+
+    def test_disjunction(self):
+        assert (Congruence(2) | Congruence(2, 1)) == Type(int)
+        assert (Members(1, 2) | Type(int)) == Type(int)
+        assert (Type(int) | Members(0.5))(0.5)
+
+    def test_subsets(self):
+        reals = Type(int, float) | (Type(complex) & Interval())
+        assert Type(int) <= reals
+        assert Congruence(4) <= Congruence(2) <= Type(int)
+        assert not Congruence(2) <= Congruence(4)
+        assert Interval(0, 1) <= Interval(-1, 1)
+        assert not Interval(0, 1) <= Interval(0, 1, low_closed=False)
+        assert Members(1j) <= Type(complex)
+        assert not reals <= Type(int, float)
+        assert reals >= Type(float) & Interval(0, inf)
+
+    def test_unrestricted_floats_are_not_all_real(self):
+        # nan is a float that no interval contains
+        assert Type(int) <= Interval()
+        assert not Type(float) <= Interval()
+
+    def test_joins_adjacent_intervals(self):
+        assert (Type(int) & Interval(0, 1)) | (Type(int) & Interval(1, 2)) == Type(int) & Interval(0, 2)
+        assert (Type(int) & Interval(0, 1)) | (Type(int) & Interval(2, 3)) == Type(int) & Interval(0, 3)
+        halves = (Type(float) & Interval(0, 1, high_closed=False)) | (Type(float) & Interval(1, 2))
+        assert halves == Type(float) & Interval(0, 2)
+        assert not (Type(float) & Interval(0, 1, high_closed=False)) | (Type(float) & Interval(1, 2, low_closed=False)) == Type(float) & Interval(0, 2)
+
+    def test_decides_subsets_by_counterexample(self):
+        evens = (Congruence(2) & Interval(0, 0)) | (Congruence(2) & Interval(2, 2))
+        assert evens == Congruence(2) & Interval(0, 2)
+        assert Type(int).subset_of(Congruence(2)) is False
+        assert Type(str).subset_of(Type(int)) is False
+        spread = (Congruence(2) & Interval(0, 10**6)) | (Congruence(2, 1) & Interval(0, 10**6))
+        assert spread.subset_of(Type(int) & Interval(0, 10**6)) is True
+        assert (Type(int) & Interval(0, 10**6)).subset_of(spread) is True
+
+    def test_decides_subsets_covered_together(self):
+        whole = Type(int) & Interval(0, 10**6)
+        pieces = (Congruence(2) & Interval(0, 600000)) | (Congruence(2, 1) & Interval(0, 500000)) | (Type(int) & Interval(500000, 10**6))
+        assert pieces.subset_of(whole) is True
+        assert whole.subset_of(pieces) is True
+        gap = (Congruence(2) & Interval(0, 600000)) | (Congruence(2, 1) & Interval(0, 499997)) | (Type(int) & Interval(500000, 10**6))
+        assert whole.subset_of(gap) is False
+        assert (Congruence(3) | Congruence(3, 1) | Congruence(6, 2) | Congruence(6, 5)) == Type(int)
+        assert Type(int).subset_of(Congruence(3) | Congruence(5) | Congruence(7)) is False
+
+    def test_decides_congruences_arithmetically(self):
+        assert Congruence(10007).subset_of(Congruence(10009)) is False
+        assert Congruence(1000003).subset_of(Congruence(1000033)) is False
+        assert Congruence(1000003 * 1000033).subset_of(Congruence(1000033)) is True
+        assert (Congruence(1000003) & Congruence(1000033, 1)) <= Congruence(1000033, 1)
+        small = Congruence(10007) & Interval(0, 10006)
+        assert small.subset_of(Congruence(10009)) is True
+        assert (Congruence(10007) & Interval(0, 10007)).subset_of(Congruence(10009)) is False
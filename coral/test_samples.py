@@ -0,0 +1,66 @@
+
+from pytest import raises
+
+from .samples import *
+
+
+class TestSampleCache:
+
+	def test_is_unbounded_by_default(self):
+		samples = SampleCache()
+		for i in range(1000):
+			samples.add(i)
+		assert len(samples) == 1000
+		assert samples.evictions == 0
+
+	def test_counts_hits_and_misses(self):
+		samples = SampleCache()
+		samples.add(1)
+		samples.add(2)
+		samples.add(1)
+		assert samples.stats == {'hits': 1, 'misses': 2, 'evictions': 0, 'size': 2, 'maxsize': None}
+
+	def test_lru_evicts_least_recently_used(self):
+		samples = SampleCache(2, 'lru')
+		samples.add(1)
+		samples.add(2)
+		samples.add(1)
+		samples.add(3)
+		assert set(samples) == {1, 3}
+		assert samples.evictions == 1
+
+	def test_first_keeps_the_first_samples(self):
+		samples = SampleCache(2, 'first')
+		for i in range(10):
+			samples.add(i)
+		assert set(samples) == {0, 1}
+		assert samples.evictions == 0
+
+	def test_reservoir_stays_bounded(self):
+		samples = SampleCache(10, 'reservoir', seed=0)
+		for i in range(1000):
+			samples.add(i)
+		assert len(samples) == 10
+		assert 0 < samples.evictions < 1000
+		assert not set(samples) == set(range(10))
+
+	def test_reports_evictions(self):
+		evicted = []
+		samples = SampleCache(1)
+		samples.on_evict = evicted.append
+		samples.add(1)
+		samples.add(2)
+		assert evicted == [1]
+
+	def test_supports_set_operations(self):
+		samples = SampleCache()
+		for i in range(4):
+			samples.add(i)
+		assert samples & {1, 2, 7} == {1, 2}
+		assert samples - {1, 2} == {0, 3}
+
+	def test_rejects_invalid_configurations(self):
+		with raises(ValueError):
+			_ = SampleCache(0)
+		with raises(ValueError):
+			_ = SampleCache(10, 'fifo')